@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+
+"""Benchmark suite for the hot paths of the post-processing tools
+   Synthetic structures and trajectories are generated in a temporary directory, so
+   no input data is needed. Every case runs in a fresh process which reports its wall
+   time, its throughput and the peak memory allocated by the timed code, measured with
+   tracemalloc in an extra untimed repetition (worker processes of a case are not
+   included). The results are written to a JSON file and two such files can be
+   compared to flag regressions of the time or of the memory
+
+   python benchmark.py run results.json [--quick]
+   python benchmark.py compare baseline.json results.json [--threshold 0.1]
+                                                          [--memory_threshold 0.1]
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+import numpy as np
+import diffraction
+import diffraction_library
+import dump_reader
+import gaussian_fitting
+import lindemann
+
+def write_xyz_structure(output_file, natoms, seed=0):
+    '''Write a random Si-O structure with the density of silica glass to an XYZ file'''
+
+    rng = np.random.default_rng(seed)
+    length = (natoms/0.066)**(1/3)
+    coords = rng.random((natoms, 3))*length
+    elements = np.where(np.arange(natoms) % 3 == 0, "Si", "O")
+
+    with open(output_file, "w", encoding="utf-8") as ofile:
+        ofile.write(f'{natoms}\nLattice="{length} 0 0 0 {length} 0 0 0 {length}"\n')
+        for element, (x, y, z) in zip(elements, coords):
+            ofile.write(f"{element} {x:.6f} {y:.6f} {z:.6f}\n")
+
+def write_dump_trajectory(output_file, natoms, nframes, seed=0):
+    '''Write a LAMMPS dump file in the "atom" style with particles vibrating around a lattice'''
+
+    rng = np.random.default_rng(seed)
+    length = (natoms/0.066)**(1/3)
+    reference = rng.random((natoms, 3))
+
+    with open(output_file, "w", encoding="utf-8") as ofile:
+        for iframe in range(nframes):
+            scaled = np.mod(reference + rng.normal(0, 0.01, reference.shape), 1)
+            ofile.write(f"ITEM: TIMESTEP\n{iframe}\nITEM: NUMBER OF ATOMS\n{natoms}\n")
+            ofile.write("ITEM: BOX BOUNDS pp pp pp\n" + f"0 {length}\n"*3)
+            ofile.write("ITEM: ATOMS id type xs ys zs\n")
+            for iatom in rng.permutation(natoms):
+                ofile.write(f"{iatom + 1} 1 {scaled[iatom, 0]:.6f} {scaled[iatom, 1]:.6f} "
+                            f"{scaled[iatom, 2]:.6f}\n")
+
+def notebook_read_dump_file(input_file):
+    '''The read_dump_file function of the Lindemann notebook, kept as a baseline'''
+
+    box = np.zeros(3)
+
+    input_file.readline()
+    input_file.readline()
+    input_file.readline()
+    natoms = int(input_file.readline().split()[0])
+    input_file.readline()
+    lx = input_file.readline().split()
+    ly = input_file.readline().split()
+    lz = input_file.readline().split()
+    box[0] = float(lx[1])-float(lx[0])
+    box[1] = float(ly[1])-float(ly[0])
+    box[2] = float(lz[1])-float(lz[0])
+    input_file.readline()
+    x = np.zeros(natoms)
+    y = np.zeros(natoms)
+    z = np.zeros(natoms)
+    for _ in range(0, natoms):
+        a = input_file.readline().split()
+        x[int(a[0])-1] = float(a[2])*box[0]
+        y[int(a[0])-1] = float(a[3])*box[1]
+        z[int(a[0])-1] = float(a[4])*box[2]
+
+    return (natoms, x, y, z, box)
+
+def notebook_compute_displacement(natoms, x, y, z, box):
+    '''The compute_displacement function of the Lindemann notebook, kept as a baseline'''
+
+    dx = x - x[0]
+    dy = y - y[0]
+    dz = z - z[0]
+
+    dx = dx - box[0]*np.rint(dx/box[0])
+    dy = dy - box[1]*np.rint(dy/box[1])
+    dz = dz - box[2]*np.rint(dz/box[2])
+
+    x = dx + x[0]
+    y = dy + y[0]
+    z = dz + z[0]
+
+    disp_x = np.power(np.outer(x, np.ones(natoms)) - x, 2)
+    disp_y = np.power(np.outer(y, np.ones(natoms)) - y, 2)
+    disp_z = np.power(np.outer(z, np.ones(natoms)) - z, 2)
+
+    square_distance = disp_x + disp_y + disp_z
+    distance = np.sqrt(square_distance)
+
+    return distance, square_distance
+
+def notebook_gaussian_potential(x, n_gaussians, *parameters):
+    '''The gaussian_potential function of the fitting notebook, with n_gaussians as argument'''
+
+    sum_gaussians = 0
+
+    for j in range(0, n_gaussians):
+        prefactor = parameters[3*j]/(parameters[3*j+1]*np.sqrt(np.pi/2))
+        exponential = np.exp((-2*np.power(parameters[3*j+2]-x, 2))/np.power(parameters[3*j+1], 2))
+        sum_gaussians += (prefactor*exponential)
+
+    return sum_gaussians
+
+# every case prepares its input in a work directory and returns the timed function and
+# the amount of work it performs together with the unit of that work
+
+def case_diffraction_exact(workdir, natoms, npoints):
+    '''The exact Debye sum of compute_diffraction'''
+
+    input_file = os.path.join(workdir, "structure.xyz")
+    write_xyz_structure(input_file, natoms)
+    elements, x, y, z = diffraction.read_xyz_file(input_file)
+    sigmas = np.sin(np.linspace(0.05, np.pi/2, npoints))/1.5418
+
+    return (lambda: diffraction.compute_diffraction(sigmas, elements, x, y, z),
+            natoms*(natoms - 1)//2*npoints, "pair-points")
+
+def case_diffraction_histogram(workdir, natoms, npoints):
+    '''The histogram engine of compute_diffraction'''
+
+    input_file = os.path.join(workdir, "structure.xyz")
+    write_xyz_structure(input_file, natoms)
+    elements, x, y, z = diffraction.read_xyz_file(input_file)
+    sigmas = np.sin(np.linspace(0.05, np.pi/2, npoints))/1.5418
+
+    return (lambda: diffraction.compute_diffraction_histogram(sigmas, elements, x, y, z),
+            natoms*(natoms - 1)//2, "pairs")
+
+def case_read_xyz_file(workdir, natoms):
+    '''Parsing of an XYZ file'''
+
+    input_file = os.path.join(workdir, "structure.xyz")
+    write_xyz_structure(input_file, natoms)
+
+    return lambda: diffraction.read_xyz_file(input_file), natoms, "atoms"
+
+def case_scattering_factor(workdir, npoints):
+    '''Evaluation of the scattering factors of all species'''
+
+    sigmas = np.linspace(0, 2, npoints)
+    species = list(diffraction_library.species)
+
+    return (lambda: diffraction_library.form_factor_matrix(species, sigmas),
+            len(species)*npoints, "factors")
+
+def case_notebook_read_dump_file(workdir, natoms, nframes):
+    '''The per-line dump parser of the Lindemann notebook'''
+
+    input_file = os.path.join(workdir, "dump.atom")
+    write_dump_trajectory(input_file, natoms, nframes)
+
+    def run():
+        with open(input_file, "r", encoding="utf-8") as ifile:
+            for _ in range(nframes):
+                notebook_read_dump_file(ifile)
+
+    return run, natoms*nframes, "atoms"
+
+def case_read_dump_frame(workdir, natoms, nframes):
+    '''The bulk dump parser of dump_reader'''
+
+    input_file = os.path.join(workdir, "dump.atom")
+    write_dump_trajectory(input_file, natoms, nframes)
+
+    def run():
+        with open(input_file, "rb") as ifile:
+            for _ in range(nframes):
+                dump_reader.read_dump_frame(ifile)
+
+    return run, natoms*nframes, "atoms"
+
+def case_notebook_compute_displacement(workdir, natoms, nframes):
+    '''The dense distance matrices and averages of the Lindemann notebook'''
+
+    input_file = os.path.join(workdir, "dump.atom")
+    write_dump_trajectory(input_file, natoms, nframes)
+    with open(input_file, "rb") as ifile:
+        frames = [dump_reader.read_dump_frame(ifile) for _ in range(nframes)]
+
+    def run():
+        ave_dist = np.zeros((natoms, natoms))
+        ave_sq_dist = np.zeros((natoms, natoms))
+        for iconf, frame in enumerate(frames):
+            dist, sq_dist = notebook_compute_displacement(*frame)
+            ave_dist = (iconf*ave_dist + dist)/(iconf+1)
+            ave_sq_dist = (iconf*ave_sq_dist + sq_dist)/(iconf+1)
+
+    return run, natoms*(natoms - 1)//2*nframes, "pair-frames"
+
+def case_lindemann_accumulator(workdir, natoms, nframes):
+    '''The streaming upper-triangle accumulator of the lindemann module'''
+
+    input_file = os.path.join(workdir, "dump.atom")
+    write_dump_trajectory(input_file, natoms, nframes)
+    with open(input_file, "rb") as ifile:
+        frames = [dump_reader.read_dump_frame(ifile)[1:] for _ in range(nframes)]
+
+    return (lambda: lindemann.lindemann_parameter(frames),
+            natoms*(natoms - 1)//2*nframes, "pair-frames")
+
+def case_notebook_gaussian_potential(workdir, npoints, n_gaussians):
+    '''Evaluation of the multi-gaussian model of the fitting notebook'''
+
+    del workdir
+    x = np.linspace(0, 10, npoints)
+    parameters = np.tile([1.0, 0.5, 5.0], n_gaussians)
+
+    return (lambda: notebook_gaussian_potential(x, n_gaussians, *parameters),
+            npoints*n_gaussians, "points")
+
+def case_gaussian_potential(workdir, npoints, n_gaussians):
+    '''Evaluation of the broadcasted multi-gaussian model of the gaussian_fitting module'''
+
+    del workdir
+    x = np.linspace(0, 10, npoints)
+    parameters = np.tile([1.0, 0.5, 5.0], n_gaussians)
+
+    return (lambda: gaussian_fitting.gaussian_potential(x, *parameters),
+            npoints*n_gaussians, "points")
+
+def synthetic_distributions(ndistributions, n_gaussians, npoints=200, seed=0):
+    '''Return noisy multi-gaussian distributions and their exact parameters'''
+
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 10, npoints)
+    distributions, exact = [], []
+    for _ in range(ndistributions):
+        centers = np.sort(rng.uniform(1, 9, n_gaussians))
+        parameters = np.column_stack((rng.uniform(0.5, 1, n_gaussians),
+                                      rng.uniform(0.3, 1, n_gaussians), centers)).ravel()
+        y = gaussian_fitting.gaussian_potential(x, *parameters)
+        distributions.append((x, y + 0.01*y.max()*rng.standard_normal(npoints)))
+        exact.append(parameters)
+
+    return distributions, exact
+
+def case_fit_gaussians(workdir, n_gaussians, analytic):
+    '''A multi-gaussian fit with the analytic or the finite difference Jacobian'''
+
+    del workdir
+    distributions, exact = synthetic_distributions(1, n_gaussians)
+    (x, y), p0 = distributions[0], 1.05*exact[0]
+    jacobian = gaussian_fitting.gaussian_jacobian if analytic else None
+
+    return (lambda: gaussian_fitting.curve_fit(gaussian_fitting.gaussian_potential, x, y, p0,
+                                               jac=jacobian, maxfev=100000),
+            1, "fits")
+
+def case_batch_fit(workdir, ndistributions):
+    '''Fitting many distributions with the process pool of the gaussian_fitting module'''
+
+    del workdir
+    distributions, _ = synthetic_distributions(ndistributions, 3)
+
+    return (lambda: gaussian_fitting.batch_fit(distributions, 3, os.cpu_count()),
+            ndistributions, "fits")
+
+def benchmark_cases(quick=False):
+    '''Return the list of benchmark cases as (name, function, parameters)'''
+
+    sizes = (250, 500, 1000) if quick else (1000, 2000, 4000, 8000)
+    points = (10, 100) if quick else (10, 100, 500)
+    frames = (5, 20) if quick else (10, 50, 100)
+    dense_sizes = sizes[:2]
+
+    cases = []
+    for natoms in sizes:
+        for npoints in points:
+            cases.append(("diffraction_exact", case_diffraction_exact,
+                          {"natoms": natoms, "npoints": npoints}))
+            cases.append(("diffraction_histogram", case_diffraction_histogram,
+                          {"natoms": natoms, "npoints": npoints}))
+        cases.append(("read_xyz_file", case_read_xyz_file, {"natoms": 100*natoms}))
+    for npoints in (10, 100, 1000, 10000):
+        cases.append(("scattering_factor", case_scattering_factor, {"npoints": npoints}))
+    for natoms in dense_sizes:
+        for nframes in frames:
+            parameters = {"natoms": natoms, "nframes": nframes}
+            cases.append(("notebook_read_dump_file", case_notebook_read_dump_file, parameters))
+            cases.append(("read_dump_frame", case_read_dump_frame, parameters))
+            cases.append(("notebook_compute_displacement", case_notebook_compute_displacement,
+                          parameters))
+            cases.append(("lindemann_accumulator", case_lindemann_accumulator, parameters))
+    for npoints in (100, 10000, 1000000):
+        for n_gaussians in (1, 4, 16):
+            cases.append(("notebook_gaussian_potential", case_notebook_gaussian_potential,
+                          {"npoints": npoints, "n_gaussians": n_gaussians}))
+            cases.append(("gaussian_potential", case_gaussian_potential,
+                          {"npoints": npoints, "n_gaussians": n_gaussians}))
+    for n_gaussians in (1, 4, 8):
+        for analytic in (False, True):
+            cases.append(("fit_gaussians", case_fit_gaussians,
+                          {"n_gaussians": n_gaussians, "analytic": analytic}))
+    cases.append(("batch_fit", case_batch_fit, {"ndistributions": 8 if quick else 64}))
+
+    return cases
+
+def _run_case(connection, function, parameters, repeats):
+    '''Run a benchmark case in a child process and send back its measurements'''
+
+    with tempfile.TemporaryDirectory() as workdir:
+        run, work, unit = function(workdir, **parameters)
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        # tracing slows the allocations down, so the memory is measured in its own run
+        tracemalloc.start()
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    connection.send({"seconds": min(times), "throughput": work/min(times), "unit": unit,
+                     "peak_memory_mb": peak_memory/1024**2})
+    connection.close()
+
+def run_benchmarks(output_file, quick=False, repeats=3, selection=None):
+    '''Run all benchmark cases, each in a fresh process, and write the results as JSON'''
+
+    results = []
+    context = multiprocessing.get_context("fork")
+    for name, function, parameters in benchmark_cases(quick):
+        if selection is not None and name not in selection:
+            continue
+
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_case, args=(sender, function, parameters, repeats))
+        process.start()
+        # only the child holds the sending end, so its exit ends the wait
+        sender.close()
+        try:
+            measurement = receiver.recv()
+        except EOFError:
+            measurement = None
+        receiver.close()
+        process.join()
+
+        # a case that raises, e.g. a MemoryError, is recorded and the suite goes on
+        if measurement is None:
+            results.append({"name": name, "parameters": parameters, "failed": True,
+                            "exitcode": process.exitcode})
+            print(f"{name:32s} {json.dumps(parameters):40s} failed with exit code "
+                  f"{process.exitcode}")
+            continue
+
+        results.append({"name": name, "parameters": parameters, **measurement})
+        print(f"{name:32s} {json.dumps(parameters):40s} {measurement['seconds']:10.4f} s "
+              f"{measurement['throughput']:12.4g} {measurement['unit']}/s "
+              f"{measurement['peak_memory_mb']:10.3f} MB")
+
+    report = {"metadata": {"date": datetime.now(timezone.utc).isoformat(),
+                           "python": platform.python_version(), "numpy": np.__version__,
+                           "machine": platform.machine(), "processor": platform.processor(),
+                           "cpus": os.cpu_count(), "repeats": repeats, "quick": quick},
+              "results": results}
+
+    with open(output_file, "w", encoding="utf-8") as ofile:
+        json.dump(report, ofile, indent=1)
+
+def compare_benchmarks(baseline_file, current_file, threshold=0.1, memory_threshold=0.1,
+                       memory_floor=1.0):
+    '''Compare two result files and return the cases that regressed
+
+    A case regresses if its wall time grew beyond the threshold or its peak memory
+    grew beyond the memory threshold. Memory increases below memory_floor MB are
+    ignored, so that the small cases do not give noisy ratios'''
+
+    with open(baseline_file, "r", encoding="utf-8") as ifile:
+        baseline = json.load(ifile)["results"]
+    with open(current_file, "r", encoding="utf-8") as ifile:
+        current = json.load(ifile)["results"]
+
+    def key(result):
+        return result["name"], json.dumps(result["parameters"], sort_keys=True)
+
+    reference = {key(result): result for result in baseline}
+    regressions = []
+    for result in current:
+        old = reference.get(key(result))
+        if old is None or old.get("failed"):
+            continue
+
+        # a case that ran in the baseline and fails now is a regression
+        if result.get("failed"):
+            regressions.append(result)
+            print(f"{result['name']:32s} {json.dumps(result['parameters']):40s} "
+                  f"failed with exit code {result['exitcode']}  REGRESSION")
+            continue
+
+        ratio = result["seconds"]/old["seconds"]
+        slower = ratio > 1 + threshold
+
+        # the memory is compared only if both files measured it in the same way
+        memory, old_memory = result.get("peak_memory_mb"), old.get("peak_memory_mb")
+        memory_ratio, larger = None, False
+        if memory is not None and old_memory is not None:
+            memory_ratio = memory/old_memory if old_memory > 0 else np.inf
+            larger = (memory_ratio > 1 + memory_threshold and
+                      memory - old_memory > memory_floor)
+
+        flag = "REGRESSION" if slower or larger else ""
+        if flag:
+            regressions.append(result)
+        memory_column = "memory x   n/a" if memory_ratio is None else f"memory x{memory_ratio:6.3f}"
+        print(f"{result['name']:32s} {json.dumps(result['parameters']):40s} "
+              f"time x{ratio:6.3f}  {memory_column}  {flag}")
+
+    return regressions
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module'''
+
+    parser = ArgumentParser(description='Benchmarking the post-processing tools')
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and write the results")
+    run.add_argument("output_file", help="The JSON file with the results")
+    run.add_argument("--quick", action="store_true", help="Use small sizes for a fast check")
+    run.add_argument("-r","--repeats", default=3, type=int, help="The number of repetitions \
+                     of every case, the fastest one is reported")
+    run.add_argument("--only", nargs="+", default=None, help="Run only the named cases")
+
+    compare = commands.add_parser("compare", help="Compare two result files")
+    compare.add_argument("baseline_file", help="The JSON file with the reference results")
+    compare.add_argument("current_file", help="The JSON file with the new results")
+    compare.add_argument("-t","--threshold", default=0.1, type=float, help="The relative \
+                         increase of the wall time flagged as a regression")
+    compare.add_argument("-mt","--memory_threshold", default=0.1, type=float, help="The \
+                         relative increase of the peak memory flagged as a regression")
+
+    return parser.parse_args()
+
+def main():
+    '''The main function of the benchmark suite'''
+
+    args = create_cli()
+
+    if args.command == "run":
+        run_benchmarks(args.output_file, args.quick, args.repeats, args.only)
+    else:
+        regressions = compare_benchmarks(args.baseline_file, args.current_file, args.threshold,
+                                         args.memory_threshold)
+        print(f"{len(regressions)} regressions beyond {100*args.threshold:.0f}% of the time or "
+              f"{100*args.memory_threshold:.0f}% of the memory")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
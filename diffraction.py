@@ -8,22 +8,29 @@
    ed E Prince (Norwell, MA: Kluwer Academic Publishers) pp 55495
 """
 
+import hashlib
+import json
 import os
+import re
 import sys
+import time
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count, islice, repeat
+from multiprocessing import shared_memory
 import numpy as np
-from diffraction_library import scattering_factor
+from diffraction_library import form_factor_matrix, scattering_factor
+from neighbour_list import CellList
+from profiling import Profiler, profile_stage, timed_iterator
 
-def create_cli():
-    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-    # set a minimal  command line interface
-    parser = ArgumentParser(description='Computing XRD patterns for given structures')
+def add_pattern_arguments(parser):
+    '''Add the options defining the angle grid and the Debye sum to a parser'''
 
-    parser.add_argument("input_file", help="The full path & name of the input XYZ file.\
-                        The coordinates should be in Angstrom")
-    parser.add_argument("output_file", help="The full path & name of the output file.\
-                        It contains the scattering angle in radians and the diffraction pattern")
     parser.add_argument("-min","--minimum_angle", default=0, type=float, help="Minimum \
                          scattering angle in radians")
     parser.add_argument("-max","--maximum_angle", default=np.pi, type=float, help="Maximum \
@@ -32,6 +39,109 @@ def create_cli():
                         to use between the minimum and maximum angle")
     parser.add_argument("-w","--wavelength", default=1.5418, type=float, help="The wavelength \
                         of the incident electrons in Angstrom")
+    parser.add_argument("-e","--engine", default="exact", choices=["exact", "histogram"],
+                        help="The engine for the Debye sum. The histogram engine bins the pair \
+                        distances once and is much faster for large structures")
+    parser.add_argument("-b","--bin_width", default=0.001, type=float, help="The width of the \
+                        distance bins in Angstrom used by the histogram engine")
+    parser.add_argument("-mem","--memory_budget","--memory-budget", default=None, type=float,
+                        help="Approximate memory in MB for the pair tiles. Without a budget all \
+                        pairs are processed at once")
+    parser.add_argument("-p","--periodic", action="store_true", help="Apply periodic boundary \
+                        conditions with the box from the Lattice entry of the extended XYZ file")
+    parser.add_argument("-rc","--cutoff", default=None, type=float, help="Only pairs closer \
+                        than the cutoff in Angstrom contribute. They are found with a cell list")
+    parser.add_argument("--window", default="none", choices=sorted(WINDOWS), help="The window \
+                        function damping the pair contributions towards the cutoff")
+    parser.add_argument("--precision", default="double", choices=sorted(PRECISIONS),
+                        help="The floating point type of the sinc sums. Single precision uses \
+                        compensated summation and deviates from double precision by about 1e-5 \
+                        of the largest intensity")
+    parser.add_argument("--kernel", default="numpy", choices=["numpy", "fused"], help="The \
+                        fused kernel computes the distance, the sinc term and the sum of every \
+                        pair in one compiled loop. It needs numba, otherwise NumPy is used")
+    parser.add_argument("-c","--cache", action="store_true", help="Cache the parsed structure \
+                        in binary files next to the input file and reuse them in later runs")
+    parser.add_argument("--histogram_cache", default=None, help="A directory where the pair \
+                        distance histograms are kept, so other wavelengths and angle grids are \
+                        evaluated without recomputing the distances. Implies the histogram engine")
+    parser.add_argument("--cache_size", default=1024, type=float, help="The maximum size in MB \
+                        of the histogram cache. The least recently used entries are removed")
+
+def check_pattern_arguments(arguments):
+    '''Perform the consistency checks of the options added by add_pattern_arguments'''
+
+    if arguments.number_of_points < 1:
+        print("The number of points must be a positive integer")
+        sys.exit()
+
+    # check that the wavelength is a positive number
+    if arguments.wavelength <= 0:
+        print("The wavelength must be a positive number. The script will exit")
+        sys.exit()
+
+    # check that the bin width is a positive number
+    if arguments.bin_width <= 0:
+        print("The bin width must be a positive number. The script will exit")
+        sys.exit()
+
+    # check that the cutoff is a positive number
+    if arguments.cutoff is not None and arguments.cutoff <= 0:
+        print("The cutoff must be a positive number. The script will exit")
+        sys.exit()
+
+    # check that the memory budget is a positive number
+    if arguments.memory_budget is not None and arguments.memory_budget <= 0:
+        print("The memory budget must be a positive number. The script will exit")
+        sys.exit()
+
+    if arguments.kernel == "fused" and njit is None:
+        print("The fused kernel needs numba, which is not installed. NumPy will be used")
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+
+    # set a minimal  command line interface
+    parser = ArgumentParser(description='Computing XRD patterns for given structures')
+
+    parser.add_argument("input_file", help="The full path & name of the input XYZ file.\
+                        The coordinates should be in Angstrom")
+    parser.add_argument("output_file", help="The full path & name of the output file.\
+                        It contains the scattering angle in radians and the diffraction pattern.\
+                        A .npz file also holds the metadata of the run, for a .npy file they are \
+                        written to a JSON file next to it. Other files are written as text")
+    add_pattern_arguments(parser)
+    parser.add_argument("-j","--workers", default=1, type=int, help="The number of worker \
+                        processes sharing the tiles of atom pairs")
+    parser.add_argument("-t","--trajectory", action="store_true", help="The input file holds \
+                        concatenated XYZ frames. The mean and variance of the pattern over the \
+                        frames are written")
+    parser.add_argument("--first", default=0, type=int, help="The first frame of the trajectory")
+    parser.add_argument("--last", default=None, type=int, help="The frame of the trajectory \
+                        where the averaging stops (not included)")
+    parser.add_argument("--stride", default=1, type=int, help="Use every stride-th frame of the \
+                        trajectory")
+    parser.add_argument("-a","--adaptive", action="store_true", help="Start from a grid of \
+                        number_of_points angles and refine it where the pattern is curved. The \
+                        output grid is not uniform")
+    parser.add_argument("--tolerance", default=1e-3, type=float, help="The interpolation error \
+                        relative to the largest intensity above which the adaptive grid is refined")
+    parser.add_argument("--max_points", default=10000, type=int, help="The maximum number of \
+                        points of the adaptive grid")
+    parser.add_argument("--profile", default=None, help="Write a JSON report with the wall \
+                        time, the peak memory and the throughput of every stage")
+    parser.add_argument("--check_accuracy", action="store_true", help="Compute the pattern with \
+                        both engines and report the maximum relative deviation")
+    parser.add_argument("--partials", action="store_true", help="Also write the partial \
+                        pattern of every element pair. They come from the same pass over the \
+                        pairs and add up to the total")
+    parser.add_argument("--checkpoint", default=None, help="A .npz file where the running sums \
+                        over the atom pairs (or the running average of a trajectory) are saved \
+                        periodically")
+    parser.add_argument("--checkpoint_interval", default=600, type=float, help="The time in \
+                        seconds between two checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint \
+                        of an interrupted run with the same input and parameters")
 
     arguments = parser.parse_args()
 
@@ -44,77 +154,1038 @@ def create_cli():
     if os.path.exists(arguments.output_file):
         print("The specified output file already exists. The script will overwrite it")
 
-    if arguments.number_of_points < 1:
-        print("The number of points must be a positive integer")
+    check_pattern_arguments(arguments)
+
+    if arguments.workers < 1:
+        print("The number of workers must be a positive integer. The script will exit")
         sys.exit()
 
-    # check that the wavelength is a positive number
-    if arguments.wavelength <= 0:
-        print("The wavelength must be a positive number. The script will exit")
+    if arguments.adaptive and arguments.trajectory:
+        print("The adaptive grid is not available for trajectories. The script will exit")
+        sys.exit()
+
+    if arguments.check_accuracy and arguments.trajectory:
+        print("The accuracy check is only available for a single structure. The script will exit")
+        sys.exit()
+
+    if arguments.tolerance <= 0:
+        print("The tolerance must be a positive number. The script will exit")
+        sys.exit()
+
+    if arguments.partials and (arguments.trajectory or arguments.adaptive):
+        print("The partials are only available for a single structure on a uniform grid. \
+The script will exit")
+        sys.exit()
+
+    if arguments.resume and arguments.checkpoint is None:
+        print("A checkpoint file is needed to resume a run. The script will exit")
+        sys.exit()
+
+    if arguments.checkpoint is not None and arguments.adaptive:
+        print("The adaptive grid cannot be checkpointed. The script will exit")
+        sys.exit()
+
+    if arguments.first < 0 or arguments.stride < 1:
+        print("The first frame must be non-negative and the stride positive. The script will exit")
         sys.exit()
 
     return arguments
 
-def compute_diffraction(sigmas, elmnts, xcoords, ycoords, zcoords):
-    '''The function performing the actual calculation '''
+def element_pair_table(elmnts):
+    '''Return the element pairs of a structure, the type of each particle and a matrix
+    with the index of the element pair for every combination of two types'''
 
-    scattering = np.zeros(sigmas.size)
+    species, types = np.unique(elmnts, return_inverse=True)
 
-    # find the unique elements in the structure
-    unique_elements = set(elmnts)
+    element_pairs = []
+    pair_index = np.zeros((species.size, species.size), dtype=int)
+    for i in range(species.size):
+        for j in range(i, species.size):
+            pair_index[i, j] = pair_index[j, i] = len(element_pairs)
+            element_pairs.append((species[i], species[j]))
 
-    # get the scattering from the dictionary for each element type
-    scattering_dict = {}
-    for ielement in unique_elements:
-        try:
-            scattering_dict[ielement] = scattering_factor[ielement](sigmas)
-        except KeyError:
-            print("The element {ielement} has no scattering function. The script will exit")
+    return element_pairs, types, pair_index
+
+def form_factor_products(sigmas, element_pairs):
+    '''Return the product of the scattering factors of every element pair (rows) at every s'''
+
+    elements = sorted({ielement for pair in element_pairs for ielement in pair})
+    for ielement in elements:
+        if ielement not in scattering_factor:
+            print(f"The element {ielement} has no scattering function. The script will exit")
             sys.exit()
 
-    # compute the distances between all pairs of particles
-    dist_x = np.transpose(np.tile(xcoords, (len(xcoords),1))) - xcoords
-    dist_y = np.transpose(np.tile(ycoords, (len(xcoords),1))) - ycoords
-    dist_z = np.transpose(np.tile(zcoords, (len(xcoords),1))) - zcoords
+    # all form factors are evaluated in a single call
+    table = dict(zip(elements, form_factor_matrix(elements, sigmas)))
+
+    return np.array([table[first]*table[second] for first, second in element_pairs])
+
+def tile_size_from_budget(memory_budget):
+    '''Return the edge of the square tiles of atom pairs fitting in a memory budget in MB'''
+
+    # a tile holds a handful of float64 and int64 arrays, about 64 bytes per pair
+    return max(1, int(np.sqrt(memory_budget*1024**2/64)))
+
+def choose_tile_size(natoms, memory_budget=None, workers=1):
+    '''Return the tile size for a structure, a memory budget in MB and a number of workers'''
+
+    tile_size = natoms if memory_budget is None else tile_size_from_budget(memory_budget)
+
+    # several tiles per worker keep all of them busy until the end
+    if workers > 1:
+        tile_size = min(tile_size, -(-natoms//(4*workers)))
+
+    return max(1, tile_size)
+
+def tile_origins(natoms, tile_size, cutoff=None):
+    '''Return the first row & column of all upper-triangular tiles of the pair matrix
+
+    With a cutoff the work is split in blocks of rows only, as the columns come
+    from the cell list'''
+
+    if cutoff is not None:
+        return list(range(0, natoms, tile_size))
+
+    return [(istart, jstart) for istart in range(0, natoms, tile_size)
+            for jstart in range(istart, natoms, tile_size)]
+
+def pair_tiles(xcoords, ycoords, zcoords, types, pair_index, tile_size, origins=None, box=None):
+    '''Walk the upper-triangular tiles of the pair matrix
+
+    For every tile yields the element pair index and the distance of all pairs i < j
+    in the tile as flat arrays, so the peak memory depends only on the tile size.
+    With the lengths of a periodic box the minimum image convention is applied'''
+
+    natoms = xcoords.size
+    if origins is None:
+        origins = tile_origins(natoms, tile_size)
+
+    for istart, jstart in origins:
+        rows = slice(istart, min(istart + tile_size, natoms))
+        cols = slice(jstart, min(jstart + tile_size, natoms))
+
+        square_distance = np.zeros((rows.stop - rows.start, cols.stop - cols.start))
+        for idim, coords in enumerate((xcoords, ycoords, zcoords)):
+            delta = coords[rows, None] - coords[None, cols]
+            if box is not None:
+                delta -= box[idim]*np.rint(delta/box[idim])
+            square_distance += np.square(delta)
+        pairs = pair_index[types[rows, None], types[None, cols]]
+
+        # the tiles on the diagonal contribute only their upper half
+        if istart == jstart:
+            upper = np.triu_indices(square_distance.shape[0], k=1)
+            yield pairs[upper], np.sqrt(square_distance[upper])
+        else:
+            yield pairs.ravel(), np.sqrt(square_distance).ravel()
+
+def neighbour_tiles(xcoords, ycoords, zcoords, types, pair_index, cutoff, tile_size,
+                    origins=None, box=None):
+    '''Yield the element pair index and the distance of all pairs i < j within the cutoff
+
+    The pairs are found with a cell list, so the cost grows linearly with the number
+    of particles. The origins are the first rows of the blocks of particles i'''
+
+    natoms = xcoords.size
+    if origins is None:
+        origins = tile_origins(natoms, tile_size, cutoff)
 
-    distance = np.sqrt(np.square(dist_x) + np.square(dist_y) + np.square(dist_z))
+    cells = CellList(np.column_stack((xcoords, ycoords, zcoords)), cutoff, box)
+    for istart in origins:
+        for first, second, distances in cells.pairs(istart, min(istart + tile_size, natoms)):
+            yield pair_index[types[first], types[second]], distances
 
-    # compute the prefactors for the scattering
-    prefactor_vector = np.zeros(xcoords.size)
+def coordinate_tiles(coordinates, types, pair_index, tile_size, origins=None, box=None):
+    '''Yield the coordinates & types of the rows and columns of the upper-triangular tiles
 
-    for iscatter, s_value in enumerate(sigmas):
+    The fused kernel computes the distances itself, so no pair arrays are formed and
+    the tiles hold views of the coordinates, the pair table and the box lengths'''
 
-        # form the factor with the atomic scattering values
-        for ielement in unique_elements:
-            prefactor_vector[elmnts == ielement] = scattering_dict[ielement][iscatter]
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    natoms = types.size
+    if origins is None:
+        origins = tile_origins(natoms, tile_size)
+    # a zero length means that the box is open in that direction
+    box = np.zeros(3) if box is None else np.asarray(box, dtype=np.float64)
 
-        prefactor_matrix = np.outer(prefactor_vector, prefactor_vector)
+    for istart, jstart in origins:
+        rows = slice(istart, min(istart + tile_size, natoms))
+        cols = slice(jstart, min(jstart + tile_size, natoms))
+        yield (coordinates[:, rows], types[rows], coordinates[:, cols], types[cols],
+               istart == jstart, pair_index, box)
 
-        # compute the sinusoidal term
-        sin_term = np.true_divide(np.sin(4*np.pi*s_value*distance), 4*np.pi*s_value*distance, \
-                where=(s_value*distance != 0) )
-        np.fill_diagonal(sin_term, 0)
+def structure_tiles(coordinates, types, pair_index, tile_size, origins=None, box=None,
+                    cutoff=None, fused=False):
+    '''Yield the pairs of a structure from the full pair matrix or from a cell list
 
-        # multiply the factor with the intermediate matrix
-        final = np.multiply(prefactor_matrix, sin_term)
+    For the fused kernel the tiles of the full pair matrix hold only coordinates'''
 
-        # sum the upper half of the matrix
-        scattering[iscatter] = 0.5*final.sum()
+    if cutoff is None and fused:
+        return coordinate_tiles(coordinates, types, pair_index, tile_size, origins, box)
+
+    if cutoff is None:
+        return pair_tiles(*coordinates, types, pair_index, tile_size, origins, box)
+
+    return neighbour_tiles(*coordinates, types, pair_index, cutoff, tile_size, origins, box)
+
+# window functions damping the pair contributions to zero at the cutoff
+WINDOWS = {
+    "none": lambda distances, cutoff: np.ones_like(distances),
+    "lorch": lambda distances, cutoff: np.sinc(distances/cutoff),
+    "cosine": lambda distances, cutoff: 0.5*(1 + np.cos(np.pi*distances/cutoff)),
+}
+
+# the floating point types of the sinc sums
+PRECISIONS = {"double": np.float64, "single": np.float32}
+
+def compensated_add(total, compensation, value):
+    '''Add value to total in place and keep the rounding error of the addition in compensation
+
+    With this Kahan summation the error of a float32 sum does not grow with the number
+    of terms. The float64 sums are accurate enough and are added directly'''
+
+    if total.dtype == np.float64:
+        total += value
+        return
+
+    corrected = value - compensation
+    previous = total.copy()
+    total += corrected
+    compensation[...] = (total - previous) - corrected
+
+def _add_sinc(sigmas, distance, weight, total, compensation):
+    '''Add weight*sinc(4*s*r) of a single distance to total for every s with Kahan summation'''
+
+    for isigma in range(sigmas.size):
+        argument = 4*np.pi*sigmas[isigma]*distance
+        term = weight if argument == 0 else weight*np.sin(argument)/argument
+        corrected = term - compensation[isigma]
+        previous = total[isigma]
+        total[isigma] += corrected
+        # the rounding error is taken from the stored value, so it holds for float32 too
+        compensation[isigma] = (total[isigma] - previous) - corrected
+
+def _fused_debye_sum(sigmas, distances, weights, total, compensation):
+    '''Add the weighted sinc terms of all distances to total without intermediate arrays'''
+
+    for idistance in range(distances.size):
+        _add_sinc(sigmas, distances[idistance], weights[idistance], total, compensation)
+
+def _fused_tile_sums(row_coords, row_types, col_coords, col_types, diagonal, pair_index, box,
+                     sigmas, pair_sums, compensation):
+    '''Compute the distance, the sinc terms and their sums for all pairs of a tile in one pass'''
+
+    for i in range(row_types.size):
+        # the tiles on the diagonal contribute only their upper half
+        for j in range(i + 1 if diagonal else 0, col_types.size):
+            square_distance = 0.0
+            for idim in range(3):
+                delta = row_coords[idim, i] - col_coords[idim, j]
+                if box[idim] > 0:
+                    delta -= box[idim]*np.rint(delta/box[idim])
+                square_distance += delta*delta
+            ipair = pair_index[row_types[i], col_types[j]]
+            _add_sinc(sigmas, np.sqrt(square_distance), 1.0, pair_sums[ipair], compensation[ipair])
+
+# the fused kernels are compiled if numba is available, otherwise the NumPy kernels are used
+if njit is not None:
+    _add_sinc = njit(cache=True)(_add_sinc)
+    _fused_debye_sum = njit(cache=True)(_fused_debye_sum)
+    _fused_tile_sums = njit(cache=True)(_fused_tile_sums)
+
+def debye_sum(sigmas, distances, weights=None, precision="double", kernel="numpy"):
+    '''Evaluate the sum of weights*sin(4*pi*s*r)/(4*pi*s*r) over the distances for every s
+
+    In single precision the terms are evaluated in float32 and the blocks are added with
+    compensated summation. The fused kernel adds the terms one by one in a compiled loop'''
+
+    dtype = PRECISIONS[precision]
+    total = np.zeros(sigmas.size, dtype=dtype)
+    compensation = np.zeros_like(total)
+
+    if kernel == "fused" and njit is not None:
+        weights = np.ones(distances.size) if weights is None else weights
+        _fused_debye_sum(sigmas, distances, weights, total, compensation)
+        return total
+
+    sigmas = sigmas.astype(dtype, copy=False)
+    distances = distances.astype(dtype, copy=False)
+    if weights is not None:
+        weights = weights.astype(dtype, copy=False)
+
+    # work on blocks of distances to bound the size of the intermediate matrix
+    for start in range(0, distances.size, 4096):
+        block = slice(start, start + 4096)
+        # np.sinc(x) is sin(pi*x)/(pi*x) and it is 1 at x = 0
+        sin_term = np.sinc(4*np.outer(sigmas, distances[block]))
+        compensated_add(total, compensation, sin_term.sum(axis=1) if weights is None
+                        else sin_term @ weights[block])
+
+    return total
+
+def sinc_sums(tiles, npairs, sigmas, cutoff=None, window="none", precision="double"):
+    '''Accumulate the sinc sums of every element pair over the given tiles'''
+
+    pair_sums = np.zeros((npairs, sigmas.size), dtype=PRECISIONS[precision])
+    compensation = np.zeros_like(pair_sums)
+    for pairs, distances in tiles:
+        for ipair in range(npairs):
+            selected = distances[pairs == ipair]
+            weights = None if cutoff is None else WINDOWS[window](selected, cutoff)
+            compensated_add(pair_sums[ipair], compensation[ipair],
+                            debye_sum(sigmas, selected, weights, precision))
+
+    return pair_sums
+
+def fused_sinc_sums(tiles, npairs, sigmas, cutoff=None, window="none", precision="double"):
+    '''Accumulate the sinc sums of every element pair with the compiled fused kernels
+
+    Without a cutoff the tiles hold coordinates and the distances are never stored,
+    with a cutoff the distances of the cell list are summed without a sinc matrix'''
+
+    pair_sums = np.zeros((npairs, sigmas.size), dtype=PRECISIONS[precision])
+    compensation = np.zeros_like(pair_sums)
+    for tile in tiles:
+        if cutoff is None:
+            _fused_tile_sums(*tile, sigmas, pair_sums, compensation)
+            continue
+
+        pairs, distances = tile
+        weights = WINDOWS[window](distances, cutoff)
+        for ipair in range(npairs):
+            selected = pairs == ipair
+            _fused_debye_sum(sigmas, distances[selected], weights[selected], pair_sums[ipair],
+                             compensation[ipair])
+
+    return pair_sums
+
+def histogram_counts(tiles, npairs, bin_width, nbins):
+    '''Accumulate the distance histogram of every element pair over the given tiles'''
+
+    counts = np.zeros(npairs*nbins)
+    for pairs, distances in tiles:
+        bins = np.minimum(np.floor(distances/bin_width).astype(int), nbins - 1)
+        counts += np.bincount(pairs*nbins + bins, minlength=counts.size)
+
+    return counts.reshape(npairs, nbins)
+
+ACCUMULATORS = {"sinc": sinc_sums, "fused": fused_sinc_sums, "histogram": histogram_counts}
+
+# the structure seen by a worker process, it lives in shared memory
+_worker_structure = {}
+
+def _attach_structure(name, natoms, pair_index, tile_size, box, cutoff):
+    '''Initialise a worker process with views of the structure in shared memory'''
+
+    shm = shared_memory.SharedMemory(name=name)
+    _worker_structure["shm"] = shm
+    _worker_structure["coords"] = np.ndarray((3, natoms), dtype=np.float64, buffer=shm.buf)
+    _worker_structure["types"] = np.ndarray(natoms, dtype=np.int64, buffer=shm.buf,
+                                            offset=3*natoms*8)
+    _worker_structure["pair_index"] = pair_index
+    _worker_structure["tile_size"] = tile_size
+    _worker_structure["box"] = box
+    _worker_structure["cutoff"] = cutoff
+
+def _accumulate_in_worker(kind, origins, parameters):
+    '''Reduce a chunk of tiles with the coordinates attached from shared memory'''
+
+    pair_index = _worker_structure["pair_index"]
+    tiles = structure_tiles(_worker_structure["coords"], _worker_structure["types"], pair_index,
+                            _worker_structure["tile_size"], origins, _worker_structure["box"],
+                            _worker_structure["cutoff"], kind == "fused")
+
+    return ACCUMULATORS[kind](tiles, pair_index.max() + 1, *parameters)
+
+# the tiles of a checkpointed run are reduced in this many chunks, whatever the workers
+CHECKPOINT_CHUNKS = 64
+
+def _sum_chunks(partials, total, done, checkpoint=None, **layout):
+    '''Add the results of the chunks in order and pass the running sum to the checkpoint
+
+    The layout (tile size & number of chunks) is saved with the sum, so a resumed run
+    splits the tiles in the same way'''
+
+    for partial in partials:
+        total = total + partial
+        done += 1
+        if checkpoint is not None:
+            checkpoint.save(pair_totals=total, chunks_done=done, **layout)
+
+    return total
+
+def accumulate_pairs(kind, parameters, coordinates, types, pair_index, tile_size, workers=1,
+                     box=None, cutoff=None, profiler=None, checkpoint=None, state=None):
+    '''Reduce all tiles of the pair matrix with the accumulator named kind
+
+    With more than one worker the tiles are dealt to a process pool. The coordinates
+    are placed once in shared memory and the partial results are summed in a fixed order.
+    In serial runs the time spent on the distances is recorded by the profiler, except
+    for the fused kernel that computes them together with the sums.
+
+    With a checkpoint the tiles are dealt to a fixed number of chunks and the running
+    sum is saved after every chunk. A run resumes from the chunks finished in its state'''
+
+    xcoords, ycoords, zcoords = coordinates
+    npairs = pair_index.max() + 1
+
+    if workers == 1 and checkpoint is None:
+        tiles = structure_tiles(coordinates, types, pair_index, tile_size, box=box, cutoff=cutoff,
+                                fused=kind == "fused")
+        if profiler is not None and kind != "fused":
+            tiles = timed_iterator(tiles, profiler, "distances", lambda tile: tile[1].size)
+        return ACCUMULATORS[kind](tiles, npairs, *parameters)
+
+    natoms = xcoords.size
+    nchunks = 4*workers if checkpoint is None else max(CHECKPOINT_CHUNKS, 4*workers)
+    total, done = 0, 0
+    if state is not None:
+        tile_size, nchunks = int(state["tile_size"]), int(state["nchunks"])
+        total, done = state["pair_totals"].copy(), int(state["chunks_done"])
+
+    # deal the tiles round robin so that every chunk gets a similar amount of work
+    origins = tile_origins(natoms, tile_size, cutoff)
+    chunks = [origins[i::nchunks] for i in range(min(len(origins), nchunks))][done:]
+    layout = {"tile_size": tile_size, "nchunks": nchunks}
+
+    if workers == 1:
+        partials = (ACCUMULATORS[kind](structure_tiles(coordinates, types, pair_index, tile_size,
+                                                       chunk, box, cutoff, kind == "fused"),
+                                       npairs, *parameters) for chunk in chunks)
+        return _sum_chunks(partials, total, done, checkpoint, **layout)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 4*natoms*8))
+    try:
+        coords = np.ndarray((3, natoms), dtype=np.float64, buffer=shm.buf)
+        coords[:] = (xcoords, ycoords, zcoords)
+        np.ndarray(natoms, dtype=np.int64, buffer=shm.buf, offset=3*natoms*8)[:] = types
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_structure,
+                                 initargs=(shm.name, natoms, pair_index, tile_size, box,
+                                           cutoff)) as pool:
+            partials = pool.map(_accumulate_in_worker, repeat(kind), chunks, repeat(parameters))
+            result = _sum_chunks(partials, total, done, checkpoint, **layout)
+        del coords
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return result
+
+def all_pairs(natoms, cutoff=None):
+    '''Return the number of pairs i < j, unknown in advance with a cutoff'''
+
+    return natoms*(natoms - 1)//2 if cutoff is None else None
+
+def compute_diffraction(sigmas, elmnts, xcoords, ycoords, zcoords, memory_budget=None,
+                        workers=1, box=None, cutoff=None, window="none", profiler=None,
+                        precision="double", kernel="numpy", partials=False, checkpoint=None,
+                        state=None):
+    '''The function performing the actual calculation
+
+    The pairs i < j are visited in square tiles. Without a memory budget (in MB)
+    the whole structure is a single tile. The tiles are shared among a number of
+    worker processes. For a periodic box the minimum image convention is used and
+    with a cutoff only the pairs found by a cell list contribute, damped by a window.
+    An optional profiling.Profiler records the time and memory of every stage.
+
+    In single precision the sinc terms are evaluated and summed in float32 with
+    compensated summation, so the rounding error does not grow with the number of
+    pairs. The error of every term is then about 1e-7*(1 + 4*pi*s*r), i.e. below 1e-5
+    for distances up to 100 Angstrom, and the deviation from double precision stays
+    below about 1e-5 of the largest intensity (near the minima of the pattern this is
+    a larger fraction of the local intensity). The fused kernel (numba) computes the
+    distance, the sinc term and the sum of every pair in one loop without temporary
+    arrays. Without numba the NumPy kernels are used.
+
+    The sums are kept per element pair, so with partials the element pairs and the
+    stacked partial patterns, which add up to the total, are returned as well. With a
+    checkpoint the running sums are saved during the pass over the pairs and a run
+    continues from the state of an earlier one'''
+
+    with profile_stage(profiler, "form_factors", sigmas=sigmas.size):
+        element_pairs, types, pair_index = element_pair_table(elmnts)
+        factors = form_factor_products(sigmas, element_pairs)
+
+    tile_size = choose_tile_size(xcoords.size, memory_budget, workers)
+    kind = "fused" if kernel == "fused" and njit is not None else "sinc"
+
+    # the sinc sums of every element pair, the form factors are applied at the end
+    with profile_stage(profiler, "pair_sums", pairs=all_pairs(xcoords.size, cutoff),
+                       sigmas=sigmas.size, workers=workers):
+        pair_sums = accumulate_pairs(kind, (sigmas, cutoff, window, precision),
+                                     (xcoords, ycoords, zcoords), types, pair_index, tile_size,
+                                     workers, box, cutoff, profiler, checkpoint, state)
+
+    with profile_stage(profiler, "combine", sigmas=sigmas.size):
+        partial_patterns = factors*pair_sums
+        scattering = np.sum(partial_patterns, axis=0)
+
+    if partials:
+        return scattering, element_pairs, partial_patterns
 
     return scattering
 
-def read_xyz_file(input_file):
-    '''Read a particle's configuration from an input file '''
+def pair_distance_histograms(elmnts, xcoords, ycoords, zcoords, bin_width=0.001,
+                             memory_budget=None, workers=1, box=None, cutoff=None,
+                             checkpoint=None, state=None):
+    '''Bin the distances of all pairs of particles into one histogram per element pair
+
+    Returns the list of element pairs, the bin centers and an array with the counts
+    of each element pair (rows) in each distance bin (columns). With a checkpoint the
+    running counts are saved as in compute_diffraction'''
+
+    element_pairs, types, pair_index = element_pair_table(elmnts)
+
+    # no distance exceeds the cutoff, half the diagonal of the box or the bounding box diagonal
+    if cutoff is not None:
+        max_distance = cutoff
+    elif box is not None:
+        max_distance = 0.5*np.linalg.norm(box)
+    else:
+        extent = [np.ptp(coords) if coords.size else 0 for coords in (xcoords, ycoords, zcoords)]
+        max_distance = np.linalg.norm(extent)
+    nbins = int(np.floor(max_distance/bin_width)) + 1
+
+    tile_size = choose_tile_size(xcoords.size, memory_budget, workers)
+    counts = accumulate_pairs("histogram", (bin_width, nbins), (xcoords, ycoords, zcoords),
+                              types, pair_index, tile_size, workers, box, cutoff,
+                              checkpoint=checkpoint, state=state)
+
+    bin_centers = (np.arange(nbins) + 0.5)*bin_width
+
+    return element_pairs, bin_centers, counts
+
+def histogram_cache_key(elmnts, xcoords, ycoords, zcoords, bin_width, box=None, cutoff=None):
+    '''Return a digest of the structure and of the parameters that define its histograms'''
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(elmnts).astype(str).tobytes())
+    for coords in (xcoords, ycoords, zcoords):
+        digest.update(np.ascontiguousarray(coords, dtype=np.float64).tobytes())
+    digest.update(repr((bin_width, None if box is None else tuple(box), cutoff)).encode())
+
+    return digest.hexdigest()
+
+def evict_histogram_cache(cache_dir, cache_size):
+    '''Remove the least recently used histograms until the cache fits in cache_size MB
+
+    Other processes may share the cache directory, so the entries they have already
+    removed are skipped'''
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(".npz"):
+            continue
+        try:
+            status = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((status.st_mtime, status.st_size, entry.path))
+    entries.sort()
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= cache_size*1024**2:
+            break
+        total -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+
+def cached_pair_distance_histograms(cache_dir, cache_size, elmnts, xcoords, ycoords, zcoords,
+                                    bin_width=0.001, memory_budget=None, workers=1, box=None,
+                                    cutoff=None, checkpoint=None, state=None):
+    '''Return the pair distance histograms from the cache directory or compute & store them
+
+    The histograms depend only on the geometry, so a single entry serves any wavelength
+    and angle grid. The cache is kept below cache_size MB by evicting old entries.
+    Returns the histograms and whether they were found in the cache'''
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = os.path.join(cache_dir, histogram_cache_key(elmnts, xcoords, ycoords, zcoords,
+                                                             bin_width, box, cutoff) + ".npz")
+
+    # the entry may be evicted by another process at any time, it is then recomputed
+    histograms = None
+    try:
+        with np.load(cache_file) as cached:
+            histograms = ([tuple(pair) for pair in cached["element_pairs"].tolist()],
+                          cached["bin_centers"], cached["counts"])
+        # mark the entry as recently used
+        os.utime(cache_file)
+    except FileNotFoundError:
+        pass
+    if histograms is not None:
+        return histograms, True
+
+    element_pairs, bin_centers, counts = pair_distance_histograms(elmnts, xcoords, ycoords,
+                                                                  zcoords, bin_width,
+                                                                  memory_budget, workers,
+                                                                  box, cutoff, checkpoint,
+                                                                  state)
+    # most bins are empty and compress well. Other processes see only complete entries,
+    # the temporary file of every process has its own name
+    temporary = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as ofile:
+        np.savez_compressed(ofile, element_pairs=np.array(element_pairs, dtype=str),
+                            bin_centers=bin_centers, counts=counts)
+    os.replace(temporary, cache_file)
+    evict_histogram_cache(cache_dir, cache_size)
+
+    return (element_pairs, bin_centers, counts), False
+
+def debye_from_histograms(sigmas, element_pairs, bin_centers, counts, cutoff=None,
+                          window="none", precision="double", kernel="numpy", partials=False):
+    '''Evaluate the Debye sum from the pair distance histograms of a structure
+
+    With partials the element pairs and the stacked partial patterns are returned too'''
+
+    factors = form_factor_products(sigmas, element_pairs)
+
+    # the window is evaluated at the bin centers
+    if cutoff is not None:
+        counts = counts*WINDOWS[window](bin_centers, cutoff)
+
+    partial_patterns = np.zeros((len(element_pairs), sigmas.size))
+    for ipair, (factor, pair_counts) in enumerate(zip(factors, counts)):
+        # only the populated bins contribute to the sum
+        populated = pair_counts != 0
+        partial_patterns[ipair] = factor*debye_sum(sigmas, bin_centers[populated],
+                                                   pair_counts[populated], precision, kernel)
+    scattering = np.sum(partial_patterns, axis=0)
+
+    if partials:
+        return scattering, element_pairs, partial_patterns
+
+    return scattering
+
+def compute_diffraction_histogram(sigmas, elmnts, xcoords, ycoords, zcoords, bin_width=0.001,
+                                  memory_budget=None, workers=1, box=None, cutoff=None,
+                                  window="none", cache_dir=None, cache_size=1024,
+                                  profiler=None, precision="double", kernel="numpy",
+                                  partials=False, checkpoint=None, state=None):
+    '''The histogram engine: the pair distances are computed once and binned per element pair
+
+    All distances in a bin are placed at the bin center, so the error of each sinc
+    term is bounded by 2*pi*s*bin_width. The default width of 0.001 Angstrom keeps the
+    relative deviation from the exact engine well below 1e-4 for X-ray wavelengths.
+    With a cache directory the histograms are reused across runs. The precision and the
+    kernel of the Debye sum over the bins, the partials and the checkpoint of the counts
+    are those of compute_diffraction'''
+
+    with profile_stage(profiler, "histograms", pairs=all_pairs(xcoords.size, cutoff),
+                       workers=workers) as record:
+        if cache_dir is None:
+            histograms = pair_distance_histograms(elmnts, xcoords, ycoords, zcoords, bin_width,
+                                                  memory_budget, workers, box, cutoff,
+                                                  checkpoint, state)
+        else:
+            histograms, record["cache_hit"] = cached_pair_distance_histograms(
+                cache_dir, cache_size, elmnts, xcoords, ycoords, zcoords, bin_width,
+                memory_budget, workers, box, cutoff, checkpoint, state)
+
+    with profile_stage(profiler, "debye_sum", sigmas=sigmas.size,
+                       bins=int(np.count_nonzero(histograms[2]))):
+        scattering = debye_from_histograms(sigmas, *histograms, cutoff, window, precision,
+                                           kernel, partials)
+
+    return scattering
+
+def compare_engines(sigmas, elmnts, xcoords, ycoords, zcoords, bin_width=0.001,
+                    memory_budget=None, workers=1, box=None, cutoff=None, window="none",
+                    exact=None, binned=None):
+    '''Return the maximum relative deviation of the histogram engine from the exact engine
+
+    A pattern already computed by one of the engines is passed as exact or binned and
+    only the other one is computed'''
+
+    if exact is None:
+        exact = compute_diffraction(sigmas, elmnts, xcoords, ycoords, zcoords, memory_budget,
+                                    workers, box, cutoff, window)
+    if binned is None:
+        binned = compute_diffraction_histogram(sigmas, elmnts, xcoords, ycoords, zcoords,
+                                               bin_width, memory_budget, workers, box, cutoff,
+                                               window)
+
+    return np.max(np.abs(binned - exact))/np.max(np.abs(exact))
+
+def parse_box(comment_line):
+    '''Return the box lengths from the Lattice entry of an extended XYZ comment line
+
+    Only orthorhombic boxes are supported. Returns None without a Lattice entry'''
+
+    match = re.search(r'Lattice\s*=\s*"([^"]*)"', comment_line)
+    if match is None:
+        return None
+
+    lattice = np.array(match.group(1).split(), dtype=float).reshape(3, 3)
+    if np.any(lattice[~np.eye(3, dtype=bool)] != 0):
+        print("Only orthorhombic boxes are supported. The script will exit")
+        sys.exit()
+
+    return np.diag(lattice).copy()
+
+def read_xyz_box(input_file):
+    '''Read the box lengths from the comment line of an extended XYZ file'''
+
+    with open(input_file, "r", encoding="utf-8") as ifile:
+        ifile.readline()
+        return parse_box(ifile.readline())
+
+def parse_xyz_block(block, natoms):
+    '''Convert the atom lines of an XYZ frame into the elements and a (3, N) coordinate array
+
+    The whole block is split at once and every column is converted in a single call'''
+
+    fields = block.split()
+    if len(fields) != 4*natoms:
+        print("The specified number of atoms differs from the number of coordinates")
+        sys.exit()
+
+    elements = np.array(fields[0::4])
+    coords = np.array([fields[1::4], fields[2::4], fields[3::4]], dtype=float)
+
+    return elements, coords
+
+def iter_xyz_frames(input_file, start=0, stop=None, step=1):
+    '''Yield the frames start:stop:step of a file with concatenated XYZ frames one at a time
+
+    Every frame is returned as the elements, the x, y, z coordinates and the box lengths,
+    which are None without a Lattice entry. The skipped frames are not parsed'''
+
+    with open(input_file, "r", encoding="utf-8") as ifile:
+        for iframe in count():
+            header = ifile.readline()
+            if not header.strip() or (stop is not None and iframe >= stop):
+                return
+            natoms = int(header.split()[0])
+            comment = ifile.readline()
+
+            if iframe < start or (iframe - start) % step:
+                for _ in range(natoms):
+                    ifile.readline()
+                continue
+
+            elements, coords = parse_xyz_block("".join(islice(ifile, natoms)), natoms)
+
+            yield elements, coords[0], coords[1], coords[2], parse_box(comment)
+
+def file_digest(input_file):
+    '''Return the BLAKE2 digest of a file read in blocks of 1 MB'''
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(input_file, "rb") as ifile:
+        for block in iter(lambda: ifile.read(1024**2), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+def structure_cache_files(input_file):
+    '''Return the names of the coordinate & metadata files caching a parsed XYZ file'''
+
+    return input_file + ".coords.npy", input_file + ".meta.npz"
+
+def load_structure_cache(input_file):
+    '''Return the cached elements and (3, N) coordinates of an XYZ file
+
+    The coordinates are memory-mapped. Returns None if there is no cache or if the
+    size, the modification time or the digest of the XYZ file have changed'''
+
+    coords_file, meta_file = structure_cache_files(input_file)
+    if not (os.path.exists(coords_file) and os.path.exists(meta_file)):
+        return None
+
+    stat = os.stat(input_file)
+    with np.load(meta_file) as meta:
+        if meta["size"] != stat.st_size or meta["mtime"] != stat.st_mtime_ns:
+            return None
+        if str(meta["digest"]) != file_digest(input_file):
+            return None
+        elements = meta["elements"]
+
+    return elements, np.load(coords_file, mmap_mode="r")
+
+def save_structure_cache(input_file, elements, coords):
+    '''Store the parsed structure next to the XYZ file, keyed on its size, mtime & digest'''
+
+    coords_file, meta_file = structure_cache_files(input_file)
+    stat = os.stat(input_file)
+    try:
+        np.save(coords_file, coords)
+        np.savez(meta_file, elements=elements, size=stat.st_size, mtime=stat.st_mtime_ns,
+                 digest=file_digest(input_file))
+    except OSError:
+        print("The structure cache could not be written next to the input file")
+
+def read_xyz_file(input_file, cache=False):
+    '''Read a particle's configuration from an input file
+
+    With the cache enabled a previously parsed structure is loaded from binary files
+    next to the input instead of parsing the text again'''
+
+    if cache:
+        cached = load_structure_cache(input_file)
+        if cached is not None:
+            elements, coords = cached
+            return (elements, coords[0], coords[1], coords[2])
 
     with open(input_file, "r", encoding="utf-8") as ifile:
         natoms = int(ifile.readline().split()[0])
         ifile.readline()
-        in_data = np.genfromtxt(ifile, dtype=None, encoding="utf-8", names=['element','x','y','z'])
-        if natoms != in_data.size:
-            print("The specified number of atoms differs from the number of coordinates")
-            sys.exit()
+        elements, coords = parse_xyz_block(ifile.read(), natoms)
+
+    if cache:
+        save_structure_cache(input_file, elements, coords)
+
+    return (elements, coords[0], coords[1], coords[2])
+
+def check_box(box, cutoff):
+    '''Check that a periodic box is given and that it is compatible with the cutoff'''
 
-    return (in_data['element'], in_data['x'], in_data['y'], in_data['z'])
+    if box is None:
+        print("The input file has no Lattice entry in its comment line. The script will exit")
+        sys.exit()
+    if cutoff is not None and cutoff > 0.5*box.min():
+        print("The cutoff must not exceed half of the box length. The script will exit")
+        sys.exit()
+
+def angle_grid(args):
+    '''Return the scattering angles selected on the command line and the matching sigmas'''
+
+    thetas = np.linspace(args.minimum_angle, args.maximum_angle, args.number_of_points)
+    sigmas = np.sin(thetas)/args.wavelength
+
+    return thetas, sigmas
+
+def selected_engine(args):
+    '''Return the name of the engine that runs, a histogram cache implies the histogram engine'''
+
+    return "histogram" if args.histogram_cache is not None else args.engine
+
+def engine_options(args):
+    '''Return the engine selected on the command line and its keyword arguments'''
+
+    options = {"memory_budget": args.memory_budget, "workers": args.workers,
+               "cutoff": args.cutoff, "window": args.window, "precision": args.precision,
+               "kernel": args.kernel}
+    if selected_engine(args) == "histogram":
+        options.update(bin_width=args.bin_width, cache_dir=args.histogram_cache,
+                       cache_size=args.cache_size)
+        return compute_diffraction_histogram, options
+
+    return compute_diffraction, options
+
+def structure_evaluator(engine, options, elements, xcoords, ycoords, zcoords, box=None):
+    '''Return a function computing the pattern of a structure for any array of sigmas
+
+    With the histogram engine the histograms are computed once and every call only
+    evaluates the Debye sum, otherwise every call runs the engine'''
+
+    if engine is not compute_diffraction_histogram:
+        return lambda sigmas: engine(sigmas, elements, xcoords, ycoords, zcoords, box=box,
+                                     **options)
+
+    options = dict(options)
+    cutoff, window = options.pop("cutoff"), options.pop("window")
+    profiler, cache_dir = options.pop("profiler", None), options.pop("cache_dir", None)
+    cache_size = options.pop("cache_size", 1024)
+    precision, kernel = options.pop("precision", "double"), options.pop("kernel", "numpy")
+
+    with profile_stage(profiler, "histograms", pairs=all_pairs(xcoords.size, cutoff),
+                       workers=options.get("workers", 1)) as record:
+        if cache_dir is None:
+            histograms = pair_distance_histograms(elements, xcoords, ycoords, zcoords, box=box,
+                                                  cutoff=cutoff, **options)
+        else:
+            histograms, record["cache_hit"] = cached_pair_distance_histograms(
+                cache_dir, cache_size, elements, xcoords, ycoords, zcoords, box=box,
+                cutoff=cutoff, **options)
+
+    return lambda sigmas: debye_from_histograms(sigmas, *histograms, cutoff, window, precision,
+                                                kernel)
+
+def adaptive_diffraction(evaluate, minimum_angle, maximum_angle, wavelength, initial_points=10,
+                         tolerance=1e-3, max_points=10000):
+    '''Sample the diffraction pattern on an angle grid refined where it is not linear
+
+    Starting from a uniform grid, the midpoint of every interval is evaluated and the
+    interval is split if the midpoint differs from the linear interpolation of its ends
+    by more than tolerance times the largest intensity. This error is proportional to
+    the local curvature, so the points gather around the peaks. The midpoints become
+    grid points and only the new midpoints are evaluated in the next pass, all in a
+    single call of evaluate. Returns the sorted angles and intensities'''
+
+    thetas = np.linspace(minimum_angle, maximum_angle, max(2, initial_points))
+    values = evaluate(np.sin(thetas)/wavelength)
+
+    # the intervals whose midpoints have to be checked
+    lower, upper = thetas[:-1], thetas[1:]
+    lower_values, upper_values = values[:-1], values[1:]
+
+    while lower.size and thetas.size + lower.size <= max_points:
+        midpoints = 0.5*(lower + upper)
+        midpoint_values = evaluate(np.sin(midpoints)/wavelength)
+
+        thetas = np.concatenate((thetas, midpoints))
+        values = np.concatenate((values, midpoint_values))
+
+        scale = max(np.max(np.abs(values)), np.finfo(float).tiny)
+        error = np.abs(midpoint_values - 0.5*(lower_values + upper_values))
+        refine = error > tolerance*scale
+
+        # both halves of a rejected interval are checked in the next pass
+        lower, upper = (np.concatenate((lower[refine], midpoints[refine])),
+                        np.concatenate((midpoints[refine], upper[refine])))
+        lower_values, upper_values = (np.concatenate((lower_values[refine],
+                                                      midpoint_values[refine])),
+                                      np.concatenate((midpoint_values[refine],
+                                                      upper_values[refine])))
+
+    order = np.argsort(thetas)
+
+    return thetas[order], values[order]
+
+def pattern_metadata(args, **settings):
+    '''Return the options of add_pattern_arguments that determine a pattern as metadata
+
+    Further settings of the run are added to the JSON string of the settings'''
+
+    settings = {"engine": selected_engine(args), "bin_width": args.bin_width, "periodic": args.periodic,
+                "cutoff": args.cutoff, "window": args.window, "precision": args.precision,
+                "kernel": args.kernel, **settings}
+
+    return {"wavelength": args.wavelength, "minimum_angle": args.minimum_angle,
+            "maximum_angle": args.maximum_angle, "number_of_points": args.number_of_points,
+            "settings": json.dumps(settings, sort_keys=True)}
+
+def run_metadata(args):
+    '''Return the parameters that determine the result of a run and the hash of its input'''
+
+    metadata = pattern_metadata(args, trajectory=args.trajectory, first=args.first,
+                                last=args.last, stride=args.stride)
+    metadata["structure_hash"] = file_digest(args.input_file)
+
+    return metadata
+
+class Checkpoint:
+    '''Periodic snapshots of the state of a long run together with the metadata of the run'''
+
+    def __init__(self, checkpoint_file, metadata, interval=600):
+
+        self.checkpoint_file = checkpoint_file
+        self.metadata = metadata
+        self.interval = interval
+        self.last_save = time.monotonic()
+
+    def load(self):
+        '''Return the state saved by an earlier run or None if there is no checkpoint
+
+        A checkpoint written with other parameters or another input is rejected'''
+
+        if not os.path.exists(self.checkpoint_file):
+            return None
+
+        with np.load(self.checkpoint_file) as saved:
+            metadata = {key: saved[key].item() for key in self.metadata if key in saved.files}
+            if metadata != self.metadata:
+                raise ValueError("The checkpoint was written by a run with other parameters")
+            return {key: saved[key] for key in saved.files if key not in self.metadata}
+
+    def save(self, force=False, **state):
+        '''Write the state if the interval has passed since the last snapshot'''
+
+        if not force and time.monotonic() - self.last_save < self.interval:
+            return
+
+        # the old checkpoint is replaced only by a complete file
+        temporary = self.checkpoint_file + ".tmp"
+        with open(temporary, "wb") as ofile:
+            np.savez(ofile, **self.metadata, **state)
+        os.replace(temporary, self.checkpoint_file)
+        self.last_save = time.monotonic()
+
+    def remove(self):
+        '''Delete the checkpoint once the run is complete'''
+
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+def trajectory_diffraction(sigmas, input_file, start=0, stop=None, step=1, periodic=False,
+                           engine=compute_diffraction, state=None, checkpoint=None, **options):
+    '''Average the diffraction pattern over the frames start:stop:step of a trajectory
+
+    The frames are read one at a time and the running mean and variance are updated
+    with Welford's algorithm. Returns the mean, the variance and the number of frames.
+    A run continues from the state of an earlier run and passes its running sums to
+    the checkpoint after every frame'''
+
+    nframes = 0
+    mean = np.zeros(sigmas.size)
+    sum_squares = np.zeros(sigmas.size)
+    if state is not None:
+        nframes = int(state["nframes"])
+        mean, sum_squares = state["mean"].copy(), state["sum_squares"].copy()
+
+    # the frames averaged before a restart are skipped
+    for elements, x_coords, y_coords, z_coords, box in iter_xyz_frames(input_file,
+                                                                        start + nframes*step,
+                                                                        stop, step):
+        if periodic:
+            check_box(box, options.get("cutoff"))
+        scatter = engine(sigmas, elements, x_coords, y_coords, z_coords,
+                         box=box if periodic else None, **options)
+
+        nframes += 1
+        delta = scatter - mean
+        mean += delta/nframes
+        sum_squares += delta*(scatter - mean)
+        if checkpoint is not None:
+            checkpoint.save(mean=mean, sum_squares=sum_squares, nframes=nframes)
+
+    variance = sum_squares/(nframes - 1) if nframes > 1 else np.zeros(sigmas.size)
+
+    return mean, variance, nframes
+
+def write_pattern(output_file, thetas, metadata=None, header="", **columns):
+    '''Write the angles and the columns of the pattern to a text, .npy or .npz file
+
+    A .npz file stores the columns by name together with the metadata of the run,
+    a .npy file stores them as one array and the metadata go to a JSON file.
+    The header is written at the top of a text file'''
+
+    extension = os.path.splitext(output_file)[1]
+    if extension == ".npz":
+        np.savez(output_file, thetas=thetas, **columns, **(metadata or {}))
+    elif extension == ".npy":
+        np.save(output_file, np.column_stack((thetas, *columns.values())))
+        if metadata is not None:
+            with open(output_file + ".json", "w", encoding="utf-8") as ofile:
+                json.dump({**metadata, "columns": ["thetas", *columns]}, ofile, indent=1)
+    else:
+        np.savetxt(output_file, np.column_stack((thetas, *columns.values())), header=header)
+
+def start_checkpoint(args, metadata):
+    '''Return the checkpoint of the run and the state to resume from, if any'''
+
+    if args.checkpoint is None:
+        return None, None
+
+    checkpoint = Checkpoint(args.checkpoint, metadata, args.checkpoint_interval)
+    if not args.resume:
+        return checkpoint, None
+
+    try:
+        state = checkpoint.load()
+    except ValueError:
+        print("The checkpoint belongs to another input or other parameters. The script will exit")
+        sys.exit()
+
+    if state is None:
+        print("No checkpoint was found, the run starts from the beginning")
+
+    return checkpoint, state
 
 def powder_diffraction():
     '''The main function for computing the diffraction pattern of a given structure '''
@@ -122,16 +1193,87 @@ def powder_diffraction():
     # get input-output files & parameters from user
     args = create_cli()
 
+    thetas, sigmas = angle_grid(args)
+    engine, options = engine_options(args)
+
+    # the stages of the engines are recorded when a profile is requested
+    profiler = Profiler() if args.profile is not None else None
+    options["profiler"] = profiler
+
+    # the metadata identify the run in checkpoints and binary outputs
+    metadata = None
+    if args.checkpoint is not None or os.path.splitext(args.output_file)[1] in (".npy", ".npz"):
+        metadata = run_metadata(args)
+    checkpoint, state = start_checkpoint(args, metadata)
+
+    # a trajectory is streamed frame by frame and only the averaged pattern is written
+    if args.trajectory:
+        mean, variance, nframes = trajectory_diffraction(sigmas, args.input_file, args.first,
+                                                         args.last, args.stride, args.periodic,
+                                                         engine, state, checkpoint, **options)
+        print(f"The pattern was averaged over {nframes} frames")
+        write_pattern(args.output_file, thetas, metadata, intensity=mean, variance=variance)
+        if checkpoint is not None:
+            checkpoint.remove()
+        if profiler is not None:
+            profiler.write_report(args.profile, input_file=args.input_file, frames=nframes,
+                                  points=sigmas.size, engine=selected_engine(args))
+        return
+
     # first step read the structure from an input XYZ file
-    elements, x_coords, y_coords, z_coords = read_xyz_file(args.input_file)
+    with profile_stage(profiler, "parse") as record:
+        elements, x_coords, y_coords, z_coords = read_xyz_file(args.input_file, args.cache)
+        record["atoms"] = elements.size
+
+    # the box is needed for periodic boundary conditions
+    box = None
+    if args.periodic:
+        box = read_xyz_box(args.input_file)
+        check_box(box, args.cutoff)
 
     # second step compute the actual scattering pattern
-    thetas = np.linspace(args.minimum_angle, args.maximum_angle, args.number_of_points)
-    sigmas = np.sin(thetas)/args.wavelength
-    scatter = compute_diffraction(sigmas, elements, x_coords, y_coords, z_coords)
+    if args.adaptive:
+        evaluate = structure_evaluator(engine, options, elements, x_coords, y_coords, z_coords,
+                                       box)
+        thetas, scatter = adaptive_diffraction(evaluate, args.minimum_angle, args.maximum_angle,
+                                               args.wavelength, args.number_of_points,
+                                               args.tolerance, args.max_points)
+        sigmas = np.sin(thetas)/args.wavelength
+        print(f"The adaptive grid has {thetas.size} points")
+    elif args.partials:
+        scatter, element_pairs, partial_patterns = engine(sigmas, elements, x_coords, y_coords,
+                                                          z_coords, box=box, partials=True,
+                                                          checkpoint=checkpoint, state=state,
+                                                          **options)
+    else:
+        # a checkpoint holds the running sums over the pairs, the expensive part of the run
+        scatter = engine(sigmas, elements, x_coords, y_coords, z_coords, box=box,
+                         checkpoint=checkpoint, state=state, **options)
+
+    if args.check_accuracy:
+        # the pattern of the engine that ran is reused, only the other engine is run
+        computed = {"exact" if engine is compute_diffraction else "binned": scatter}
+        deviation = compare_engines(sigmas, elements, x_coords, y_coords, z_coords, args.bin_width,
+                                    args.memory_budget, args.workers, box, args.cutoff,
+                                    args.window, **computed)
+        print(f"Maximum relative deviation of the histogram engine: {deviation:.3e}")
 
     # third step write the computed data to the output file
-    np.savetxt(args.output_file, np.c_[thetas, scatter])
+    # the partial patterns follow the total, one column per element pair
+    columns = {"intensity": scatter}
+    if args.partials:
+        columns.update((f"{first}-{second}", partial) for (first, second), partial
+                       in zip(element_pairs, partial_patterns))
+
+    with profile_stage(profiler, "write"):
+        write_pattern(args.output_file, thetas, metadata,
+                      " ".join(["thetas", *columns]) if args.partials else "", **columns)
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    if profiler is not None:
+        profiler.write_report(args.profile, input_file=args.input_file, atoms=elements.size,
+                              points=sigmas.size, engine=selected_engine(args))
 
 if __name__ == "__main__":
     powder_diffraction()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+"""Computes the powder XRD patterns of many XYZ files in one run
+   The input files are given as directories, glob patterns or a manifest with one
+   file per line. They are processed by a pool of worker processes that import NumPy
+   and the scattering factor table once and keep them for all their jobs.
+   The options of the Debye sum are the same as in diffraction.py. The parameters of
+   the run are stored with the outputs, so a file is recomputed when they change
+"""
+
+import glob
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from diffraction import (add_pattern_arguments, angle_grid, check_box, check_pattern_arguments,
+                         engine_options, pattern_metadata, read_xyz_box, read_xyz_file)
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+
+    parser = ArgumentParser(description='Computing XRD patterns for many structures')
+
+    parser.add_argument("inputs", nargs="*", help="Input XYZ files, directories with XYZ files \
+                        or glob patterns")
+    parser.add_argument("-m","--manifest", default=None, help="A text file with the full path & \
+                        name of one input XYZ file per line")
+    parser.add_argument("-o","--output_dir", default=".", help="The directory where one output \
+                        file is written per input file")
+    parser.add_argument("--combined", default=None, help="Write all patterns to a single .npz \
+                        file instead of one output file per input")
+    add_pattern_arguments(parser)
+    parser.add_argument("-j","--workers", default=1, type=int, help="The number of worker \
+                        processes, every worker computes one structure at a time")
+    parser.add_argument("-f","--force", action="store_true", help="Recompute the patterns even \
+                        if the output is newer than the input and has the same parameters")
+
+    arguments = parser.parse_args()
+
+    if not arguments.inputs and arguments.manifest is None:
+        print("No input files were specified. The script will exit")
+        sys.exit()
+
+    if arguments.manifest is not None and not os.path.exists(arguments.manifest):
+        print("The specified manifest does not exist. The script will exit")
+        sys.exit()
+
+    check_pattern_arguments(arguments)
+
+    if arguments.workers < 1:
+        print("The number of workers must be a positive integer. The script will exit")
+        sys.exit()
+
+    return arguments
+
+def collect_input_files(inputs, manifest=None):
+    '''Expand directories, glob patterns and a manifest into a sorted list of XYZ files'''
+
+    patterns = list(inputs)
+    if manifest is not None:
+        with open(manifest, "r", encoding="utf-8") as ifile:
+            patterns.extend(line.strip() for line in ifile if line.strip())
+
+    input_files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            input_files.update(glob.glob(os.path.join(pattern, "*.xyz")))
+        else:
+            input_files.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+    return sorted(input_files)
+
+def input_root(input_files):
+    '''Return the deepest directory containing all input files'''
+
+    return os.path.commonpath([os.path.dirname(os.path.abspath(input_file))
+                               for input_file in input_files])
+
+def output_file_for(input_file, output_dir, root):
+    '''Return the output file of an input file in the output directory
+
+    The path of the input file relative to the root is kept, so inputs with the same
+    name in different directories get different outputs'''
+
+    relative = os.path.relpath(os.path.abspath(input_file), root)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + ".txt")
+
+def stored_metadata(output_file):
+    '''Return the metadata of the run that wrote an output file, None if there are none
+
+    A combined .npz file holds them as scalar entries, a text output in a JSON file
+    next to it'''
+
+    if os.path.splitext(output_file)[1] == ".npz":
+        with np.load(output_file) as saved:
+            return {key: saved[key].item() for key in saved.files if saved[key].ndim == 0}
+
+    if not os.path.exists(output_file + ".json"):
+        return None
+    with open(output_file + ".json", "r", encoding="utf-8") as ifile:
+        return json.load(ifile)
+
+def is_up_to_date(output_file, input_files, metadata):
+    '''Check if an output file is newer than all of its input files and has the same metadata'''
+
+    if not os.path.exists(output_file):
+        return False
+
+    output_time = os.path.getmtime(output_file)
+    if any(os.path.getmtime(input_file) > output_time for input_file in input_files):
+        return False
+
+    return stored_metadata(output_file) == metadata
+
+def combined_patterns(combined_file, input_files, metadata):
+    '''Return the patterns of the input files that are up to date in a combined file
+
+    A file computed with other parameters gives no patterns. Input files missing from
+    it, e.g. because they failed, or newer than it are left out and recomputed'''
+
+    if not is_up_to_date(combined_file, [], metadata):
+        return {}
+
+    output_time = os.path.getmtime(combined_file)
+    with np.load(combined_file) as saved:
+        return {input_file: pattern for input_file, pattern in zip(saved["files"].tolist(),
+                                                                   saved["patterns"])
+                if input_file in input_files and os.path.getmtime(input_file) <= output_time}
+
+# the settings shared by all jobs of a worker process
+_batch_settings = {}
+
+def _initialize_worker(args):
+    '''Keep the angle grid and the engine in the worker for all of its jobs'''
+
+    thetas, sigmas = angle_grid(args)
+    engine, options = engine_options(args)
+
+    # the structures are distributed over the workers, each one runs serially
+    options["workers"] = 1
+    _batch_settings.update(args=args, thetas=thetas, sigmas=sigmas, engine=engine,
+                           options=options)
+
+def compute_file(input_file):
+    '''Compute the diffraction pattern of a single XYZ file in a worker process'''
+
+    args = _batch_settings["args"]
+    elements, x_coords, y_coords, z_coords = read_xyz_file(input_file, args.cache)
+
+    box = None
+    if args.periodic:
+        box = read_xyz_box(input_file)
+        check_box(box, args.cutoff)
+
+    return _batch_settings["engine"](_batch_settings["sigmas"], elements, x_coords, y_coords,
+                                     z_coords, box=box, **_batch_settings["options"])
+
+def batch_diffraction():
+    '''The main function for computing the diffraction patterns of many structures'''
+
+    args = create_cli()
+    input_files = collect_input_files(args.inputs, args.manifest)
+    if not input_files:
+        print("No XYZ files were found. The script will exit")
+        sys.exit()
+
+    # the files with an output of the same parameters newer than the input are skipped
+    root = input_root(input_files)
+    metadata = pattern_metadata(args)
+    patterns = {}
+    if args.combined is not None:
+        if not args.force:
+            patterns = combined_patterns(args.combined, input_files, metadata)
+        pending = [input_file for input_file in input_files if input_file not in patterns]
+    else:
+        pending = [input_file for input_file in input_files if args.force or not
+                   is_up_to_date(output_file_for(input_file, args.output_dir, root),
+                                 [input_file], metadata)]
+
+    print(f"{len(pending)} of {len(input_files)} files need to be processed")
+    if not pending:
+        return
+
+    thetas, _ = angle_grid(args)
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_initialize_worker,
+                             initargs=(args,)) as pool:
+        jobs = {pool.submit(compute_file, input_file): input_file for input_file in pending}
+        for ijob, job in enumerate(as_completed(jobs), 1):
+            input_file = jobs[job]
+            # a structure that cannot be processed exits its job, the batch goes on
+            try:
+                pattern = job.result()
+            except (Exception, SystemExit) as error:
+                failed.append(input_file)
+                print(f"[{ijob}/{len(pending)}] {input_file} failed {error}".rstrip())
+                continue
+
+            if args.combined is None:
+                output_file = output_file_for(input_file, args.output_dir, root)
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                np.savetxt(output_file, np.c_[thetas, pattern])
+                with open(output_file + ".json", "w", encoding="utf-8") as ofile:
+                    json.dump(metadata, ofile, indent=1)
+            else:
+                patterns[input_file] = pattern
+            print(f"[{ijob}/{len(pending)}] {input_file}")
+
+    # the patterns kept from an earlier run are written again with the new ones
+    if args.combined is not None and patterns:
+        completed = [input_file for input_file in input_files if input_file in patterns]
+        np.savez(args.combined, files=np.array(completed), thetas=thetas,
+                 patterns=np.array([patterns[input_file] for input_file in completed]),
+                 **metadata)
+
+    if failed:
+        print(f"{len(failed)} files failed:")
+        for input_file in failed:
+            print(input_file)
+
+if __name__ == "__main__":
+    batch_diffraction()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+"""Reader of LAMMPS dump files written with the "atom" or "atom/gz" style
+   The atom block of a frame is parsed in bulk into NumPy arrays and sorted by the
+   atom id. A byte offset index of the frame starts is kept next to the dump file,
+   so any frame can be read without parsing the frames before it. Gzipped files are
+   opened with the optional indexed_gzip module, whose seek points are stored as well;
+   without it the standard gzip module is used and seeking decompresses from the start
+"""
+
+import gzip
+import os
+import numpy as np
+
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
+
+def read_dump_frame(input_file):
+    '''Read the next frame from a dump file opened in binary mode
+
+    Returns the number of atoms, the x, y, z coordinates sorted by atom id and the
+    box lengths, like the read_dump_file function of the Lindemann notebook'''
+
+    box_bounds = np.zeros((3, 2))
+
+    input_file.readline()
+    input_file.readline()
+    input_file.readline()
+    natoms = int(input_file.readline().split()[0])
+    input_file.readline()
+    for idim in range(3):
+        box_bounds[idim] = input_file.readline().split()[:2]
+    columns = input_file.readline().split()[2:]
+
+    # the whole atom block is converted in a single call
+    block = b"".join(input_file.readline() for _ in range(natoms))
+    atoms = np.fromstring(block, sep=" ")
+    if atoms.size != natoms*len(columns):
+        raise ValueError("The atom block of the dump file is incomplete")
+    atoms = atoms.reshape(natoms, len(columns))
+
+    order = np.argsort(atoms[:, 0], kind="stable")
+    box = box_bounds[:, 1] - box_bounds[:, 0]
+
+    # the "atom" style stores scaled coordinates
+    x = atoms[order, 2]*box[0]
+    y = atoms[order, 3]*box[1]
+    z = atoms[order, 4]*box[2]
+
+    return (natoms, x, y, z, box)
+
+def skip_dump_frame(input_file):
+    '''Skip the next frame of a dump file. Returns False at the end of the file'''
+
+    if not input_file.readline():
+        return False
+
+    input_file.readline()
+    input_file.readline()
+    natoms = int(input_file.readline().split()[0])
+    for _ in range(5 + natoms):
+        input_file.readline()
+
+    return True
+
+class DumpReader:
+    '''Random access to the frames of a plain or gzipped LAMMPS dump file'''
+
+    def __init__(self, dump_file, persistent_index=True):
+
+        self.dump_file = dump_file
+        self.compressed = dump_file.endswith(".gz")
+        self.index_file = dump_file + ".frames.npz"
+        self.gzip_index_file = dump_file + ".gzidx"
+        self.persistent_index = persistent_index
+
+        self.handle = self._open()
+        self.offsets = self._load_index()
+        if self.offsets is None:
+            self.offsets = self._build_index()
+
+    def _open(self):
+        '''Open the dump file in binary mode, with seek points for gzipped files if possible'''
+
+        if not self.compressed:
+            return open(self.dump_file, "rb")
+
+        if indexed_gzip is None:
+            return gzip.open(self.dump_file, "rb")
+
+        handle = indexed_gzip.IndexedGzipFile(self.dump_file)
+        if self.persistent_index and self._index_is_current(self.gzip_index_file):
+            handle.import_index(self.gzip_index_file)
+
+        return handle
+
+    def _index_is_current(self, index_file):
+        '''Check that an index file exists and is newer than the dump file'''
+
+        return os.path.exists(index_file) and \
+            os.path.getmtime(index_file) >= os.path.getmtime(self.dump_file)
+
+    def _load_index(self):
+        '''Return the stored frame offsets or None if the index is missing or stale'''
+
+        if not (self.persistent_index and self._index_is_current(self.index_file)):
+            return None
+
+        with np.load(self.index_file) as index:
+            if index["size"] != os.path.getsize(self.dump_file):
+                return None
+            return index["offsets"]
+
+    def _build_index(self):
+        '''Scan the dump file once and record the offset of the start of every frame'''
+
+        offsets = []
+        self.handle.seek(0)
+        while True:
+            offset = self.handle.tell()
+            if not skip_dump_frame(self.handle):
+                break
+            offsets.append(offset)
+        offsets = np.array(offsets, dtype=np.int64)
+
+        if self.persistent_index:
+            try:
+                np.savez(self.index_file, offsets=offsets,
+                         size=os.path.getsize(self.dump_file))
+                if self.compressed and indexed_gzip is not None:
+                    self.handle.export_index(self.gzip_index_file)
+            except OSError:
+                print("The frame index could not be written next to the dump file")
+
+        return offsets
+
+    def __len__(self):
+        return self.offsets.size
+
+    def read_frame(self, iframe):
+        '''Return the frame with the given index as in read_dump_frame'''
+
+        self.handle.seek(int(self.offsets[iframe]))
+        return read_dump_frame(self.handle)
+
+    def frames(self, start=0, stop=None, step=1):
+        '''Yield the frames start:stop:step one at a time'''
+
+        for iframe in range(len(self))[start:stop:step]:
+            yield self.read_frame(iframe)
+
+    def __iter__(self):
+        return self.frames()
+
+    def close(self):
+        '''Close the dump file'''
+
+        self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
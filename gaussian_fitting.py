@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+"""Fitting of bond & angle distributions to a sum of n Gaussian functions
+   P(theta) = sum_i A_i/(w_i sqrt(pi/2)) exp(-2 (theta - theta_ci)^2/w_i^2)
+   as in eqn 2 of "Multicentered Gaussian-Based Potentials for Coarse-Grained Polymer
+   Simulations: Linking Atomistic and Mesoscopic Scales". The parameters are ordered
+   as in the fitting notebook, area, width & center of every Gaussian in turn.
+   The model is evaluated for all Gaussians at once and its Jacobian is analytic.
+   Run as a script it fits the distributions of many input files with a pool of
+   worker processes. The histograms of the input files are built in blocks with the
+   streaming_histogram module, so the samples are never loaded at once
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.interpolate import splev, splrep
+from scipy.optimize import curve_fit
+from scipy.stats import t as student_t
+from streaming_histogram import file_histogram
+
+def _components(x, parameters):
+    '''Return the areas, widths & centers and the exponential of every Gaussian
+
+    The first axis runs over the Gaussians and the others are those of x, so x may
+    be a scalar or an array of any shape'''
+
+    x = np.asarray(x, dtype=float)
+    areas, widths, centers = np.reshape(np.asarray(parameters, dtype=float),
+                                        (-1, 3) + (1,)*x.ndim).swapaxes(0, 1)
+    distance = x - centers
+    exponential = np.exp(-2*np.square(distance)/np.square(widths))
+
+    return areas, widths, distance, exponential
+
+def gaussian_potential(x, *parameters):
+    '''The sum of len(parameters)//3 Gaussians with the given areas, widths & centers
+
+    All Gaussians are evaluated as one (n_gaussians, *x.shape) array, so any number
+    of components is possible and no global variable is needed. The result has the
+    shape of x'''
+
+    areas, widths, _, exponential = _components(x, parameters)
+
+    return np.sum(areas/(widths*np.sqrt(np.pi/2))*exponential, axis=0)
+
+def gaussian_jacobian(x, *parameters):
+    '''The derivatives of gaussian_potential with respect to every parameter
+
+    Returns an array of shape (x.size, len(parameters)) as expected by curve_fit'''
+
+    areas, widths, distance, exponential = _components(x, parameters)
+
+    unit_area = exponential/(widths*np.sqrt(np.pi/2))
+    gaussians = areas*unit_area
+    derivatives = np.stack((unit_area,
+                            gaussians*(4*np.square(distance)/widths**3 - 1/widths),
+                            gaussians*4*distance/np.square(widths)), axis=1)
+
+    return derivatives.reshape(len(parameters), -1).T
+
+def initial_guess(x, y, n_gaussians):
+    '''Return starting parameters for any number of Gaussians
+
+    The total area is shared equally and the widths are twice the standard deviation
+    of the distribution over n_gaussians. The centers are placed at the highest local
+    maxima of the smoothed distribution and the remaining ones at its quantiles'''
+
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    weights = np.clip(y, 0, None)
+    if not weights.any():
+        weights = np.ones(x.size)
+
+    area = np.trapezoid(y, x) if hasattr(np, "trapezoid") else np.trapz(y, x)
+    mean = np.average(x, weights=weights)
+    std = np.sqrt(np.average(np.square(x - mean), weights=weights))
+    spacing = np.ptp(x)/max(1, x.size - 1)
+
+    # the maxima are taken from a moving average, so the noise of a histogram is ignored
+    window = max(3, x.size//20) | 1
+    smooth = np.convolve(np.pad(y, window//2, mode="edge"), np.ones(window)/window, "valid")
+    maxima = np.flatnonzero((smooth[1:-1] > smooth[:-2]) & (smooth[1:-1] >= smooth[2:])) + 1
+    maxima = maxima[np.argsort(smooth[maxima])[::-1]][:n_gaussians]
+    cumulative = np.cumsum(weights)/np.sum(weights)
+    quantiles = (np.arange(n_gaussians - maxima.size) + 0.5)/(n_gaussians - maxima.size or 1)
+    centers = np.sort(np.concatenate((x[maxima], np.interp(quantiles, cumulative, x))))
+    width = max(2*std/n_gaussians, spacing)
+
+    return np.column_stack((np.full(n_gaussians, area/n_gaussians),
+                            np.full(n_gaussians, width), centers)).ravel()
+
+def fit_gaussians(x, y, n_gaussians, p0=None, **kwargs):
+    '''Fit n Gaussians to the points x, y with the analytic Jacobian
+
+    Returns the optimal parameters and their covariance as curve_fit does'''
+
+    if p0 is None:
+        p0 = initial_guess(x, y, n_gaussians)
+
+    return curve_fit(gaussian_potential, x, y, p0, jac=gaussian_jacobian, **kwargs)
+
+def parameter_errors(pcov, npoints, alpha=0.05):
+    '''Return the half width of the confidence intervals of the parameters as in the notebook'''
+
+    return student_t.ppf(1 - alpha/2, npoints - 1)*np.sqrt(np.diag(pcov))/np.sqrt(npoints)
+
+def distribution_histogram(values, bins=100):
+    '''Return the bin centers and the probability density of the values'''
+
+    density, bin_edges = np.histogram(values, bins=bins, density=True)
+
+    return 0.5*(bin_edges[:-1] + bin_edges[1:]), density
+
+def spline_smoothing(x, y, smoothing=0.4, npoints=None):
+    '''Return a smoothing spline of the distribution evaluated on npoints equidistant points
+
+    As in the notebook the smoothing factor is 0.4 and the points span the bin centers'''
+
+    spline = splrep(x, y, s=smoothing, per=False)
+    smooth_x = np.linspace(x[0], x[-1], x.size if npoints is None else npoints)
+
+    return smooth_x, splev(smooth_x, spline)
+
+def _fit_job(job):
+    '''Fit a single distribution in a worker process, a failed fit gives None'''
+
+    x, y, n_gaussians = job
+    try:
+        return fit_gaussians(x, y, n_gaussians)
+    except (RuntimeError, ValueError):
+        return None
+
+def batch_fit(distributions, n_gaussians, workers=1):
+    '''Fit many distributions given as (x, y) pairs across a pool of worker processes
+
+    The number of Gaussians is a single integer or one integer per distribution.
+    Returns the (popt, pcov) of every distribution in order, or None if its fit failed'''
+
+    if np.ndim(n_gaussians) == 0:
+        n_gaussians = [n_gaussians]*len(distributions)
+    jobs = [(x, y, ngauss) for (x, y), ngauss in zip(distributions, n_gaussians)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_fit_job, jobs, chunksize=max(1, len(jobs)//(4*workers))))
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+
+    parser = ArgumentParser(description='Fitting multi-gaussian functions to distributions')
+
+    parser.add_argument("output_file", help="The full path & name of the output file. It holds \
+                        one line per Gaussian with the area, width, center & their errors")
+    parser.add_argument("input_files", nargs="+", help="The files with the bond/angle values \
+                        in the second column after one header line, as in the fitting notebook")
+    parser.add_argument("-n","--number_of_gaussians", nargs="+", default=[4], type=int,
+                        help="The number of Gaussians, one for all files or one per file")
+    parser.add_argument("-b","--bins", default=100, type=int, help="The number of bins of the \
+                        histograms")
+    parser.add_argument("-r","--range", nargs=2, default=None, type=float, help="The lower & \
+                        upper edge of the histograms. By default they are the minimum & maximum \
+                        of every file, found in a first pass")
+    parser.add_argument("-s","--smoothing", default=None, type=float, help="Fit a smoothing \
+                        spline of the histogram with this smoothing factor, 0.4 in the notebook")
+    parser.add_argument("--block_size", default=64, type=float, help="The size in MB of the \
+                        blocks in which the input files are read")
+    parser.add_argument("-a","--alpha", default=0.05, type=float, help="The significance level \
+                        of the parameter errors")
+    parser.add_argument("-j","--workers", default=os.cpu_count(), type=int, help="The number \
+                        of worker processes")
+
+    arguments = parser.parse_args()
+
+    for input_file in arguments.input_files:
+        if not os.path.exists(input_file):
+            print(f"The input file {input_file} does not exist. The script will exit")
+            sys.exit()
+
+    if len(arguments.number_of_gaussians) not in (1, len(arguments.input_files)):
+        print("Give one number of Gaussians or one per input file. The script will exit")
+        sys.exit()
+
+    if min(arguments.number_of_gaussians) < 1 or arguments.bins < 2 or arguments.workers < 1:
+        print("The number of Gaussians, bins and workers must be positive. The script will exit")
+        sys.exit()
+
+    if arguments.range is not None and arguments.range[0] >= arguments.range[1]:
+        print("The lower edge of the range must be below the upper one. The script will exit")
+        sys.exit()
+
+    if arguments.block_size <= 0:
+        print("The block size must be a positive number. The script will exit")
+        sys.exit()
+
+    return arguments
+
+def main():
+    '''The main function for fitting the distributions of many input files'''
+
+    args = create_cli()
+
+    # every file is split into shards binned by the workers
+    distributions = [file_histogram(input_file, args.bins, args.range, args.workers,
+                                    block_size=args.block_size).distribution()
+                     for input_file in args.input_files]
+    if args.smoothing is not None:
+        distributions = [spline_smoothing(x, y, args.smoothing) for x, y in distributions]
+
+    n_gaussians = args.number_of_gaussians
+    if len(n_gaussians) == 1:
+        n_gaussians = n_gaussians*len(args.input_files)
+
+    results = batch_fit(distributions, n_gaussians, args.workers)
+
+    with open(args.output_file, "w", encoding="utf-8") as ofile:
+        ofile.write("# file gaussian area width center area_error width_error center_error "
+                    "mean_squared_residual\n")
+        for input_file, (x, y), result in zip(args.input_files, distributions, results):
+            if result is None:
+                print(f"The fit of {input_file} did not converge")
+                continue
+            popt, pcov = result
+            residual = np.mean(np.square(gaussian_potential(x, *popt) - y))
+            errors = parameter_errors(pcov, x.size, args.alpha)
+            for igauss, (values, deltas) in enumerate(zip(popt.reshape(-1, 3),
+                                                          errors.reshape(-1, 3))):
+                columns = " ".join(f"{value:.8e}" for value in (*values, *deltas))
+                ofile.write(f"{input_file} {igauss} {columns} {residual:.8e}\n")
+
+if __name__ == "__main__":
+    main()
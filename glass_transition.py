@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+"""Batch computation of the glass transition temperature with uncertainties
+   A single hyperbola, Eq. (1) of Patrone et al, Polymer 87 (2016) 246-259
+   rho(T) = rho0 - alpha (T - T0) - beta H(T, T0, gamma)
+   H(T, T0, gamma) = (T - T0)/2 + sqrt((T - T0)^2/4 + exp(gamma))
+   is fitted to the density vs temperature data of every input file as in the
+   glass_transition_temperature notebook, with an analytic Jacobian and starting
+   values taken from the data. The uncertainty of Tg = T0 is estimated by bootstrap
+   or jackknife resampling and the fits of all resamples are shared by a pool of
+   worker processes
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import curve_fit
+from scipy.stats import norm
+
+def density_hyperbola(x, rho0, t0, alpha, bita, gamma):
+    '''The hyperbola of the notebook'''
+
+    dT = x - t0
+    H0 = 0.5 * dT + np.sqrt(0.25 * dT * dT + np.exp(gamma))
+    rho = rho0 - alpha * dT - bita * H0
+    return rho
+
+def hyperbola_jacobian(x, rho0, t0, alpha, bita, gamma):
+    '''The derivatives of density_hyperbola with respect to its five parameters'''
+
+    dT = x - t0
+    root = np.sqrt(0.25*dT*dT + np.exp(gamma))
+
+    return np.column_stack((np.ones_like(dT),
+                            alpha + bita*(0.5 + 0.25*dT/root),
+                            -dT,
+                            -(0.5*dT + root),
+                            -bita*np.exp(gamma)/(2*root)))
+
+def initial_guess(temperature, density):
+    '''Return starting parameters from straight lines through the glass & the melt
+
+    Far below T0 the hyperbola has the slope -alpha and far above it the slope
+    -(alpha + beta), so lines are fitted to the coldest and the hottest third of
+    the data. Their intersection gives T0 & rho0 and the width of the transition
+    is set to a tenth of the temperature range'''
+
+    order = np.argsort(temperature)
+    temperature, density = temperature[order], density[order]
+    third = max(2, temperature.size//3)
+
+    glass = np.polyfit(temperature[:third], density[:third], 1)
+    melt = np.polyfit(temperature[-third:], density[-third:], 1)
+
+    alpha, bita = -glass[0], glass[0] - melt[0]
+    t0 = np.median(temperature)
+    if bita != 0:
+        t0 = (melt[1] - glass[1])/(glass[0] - melt[0])
+    # an intersection outside the data is not a useful starting point
+    if not temperature[0] < t0 < temperature[-1]:
+        t0 = np.median(temperature)
+
+    width = 0.1*np.ptp(temperature)
+
+    return np.array([np.polyval(glass, t0), t0, alpha, bita, 2*np.log(0.5*width)])
+
+def fit_tg(temperature, density, p0=None):
+    '''Fit the hyperbola with the analytic Jacobian, returns the parameters & their covariance'''
+
+    if p0 is None:
+        p0 = initial_guess(temperature, density)
+
+    return curve_fit(density_hyperbola, temperature, density, p0, jac=hyperbola_jacobian,
+                     maxfev=10000)
+
+def resample_indices(npoints, method="bootstrap", n_resamples=1000, rng=None):
+    '''Return the indices of the data points in every resample as rows
+
+    A bootstrap resample draws npoints points with replacement, a jackknife
+    resample leaves out one point'''
+
+    if method == "jackknife":
+        return np.array([np.delete(np.arange(npoints), ipoint) for ipoint in range(npoints)])
+
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.integers(0, npoints, size=(n_resamples, npoints))
+
+def _fit_resamples(job):
+    '''Return the Tg of every resample of a dataset, NaN where the fit fails'''
+
+    temperature, density, p0, indices = job
+
+    tg_values = np.full(len(indices), np.nan)
+    for iresample, resample in enumerate(indices):
+        try:
+            tg_values[iresample] = fit_tg(temperature[resample], density[resample], p0)[0][1]
+        except (RuntimeError, ValueError):
+            continue
+
+    return tg_values
+
+def tg_uncertainty(tg, tg_values, method="bootstrap", confidence=0.95):
+    '''Return the standard error and the confidence interval of Tg from the resamples
+
+    The bootstrap interval is given by the percentiles of the resampled values, the
+    jackknife one by the normal quantiles around the estimate'''
+
+    tg_values = tg_values[np.isfinite(tg_values)]
+    if tg_values.size < 2:
+        return np.nan, np.nan, np.nan
+
+    if method == "jackknife":
+        nvalues = tg_values.size
+        error = np.sqrt((nvalues - 1)/nvalues*np.sum(np.square(tg_values - tg_values.mean())))
+        quantile = norm.ppf(0.5 + 0.5*confidence)
+        return error, tg - quantile*error, tg + quantile*error
+
+    lower, upper = np.percentile(tg_values, [50 - 50*confidence, 50 + 50*confidence])
+    return np.std(tg_values, ddof=1), lower, upper
+
+def batch_tg(datasets, method="bootstrap", n_resamples=1000, workers=1, confidence=0.95,
+             seed=None):
+    '''Fit many (temperature, density) datasets and resample them across a process pool
+
+    The resamples of all datasets are split into chunks so that every worker gets a
+    similar share even for a few datasets. Returns one dictionary per dataset with
+    the parameters, Tg, its standard error & confidence interval and the number of
+    failed resample fits. The parameters are None if the fit of the full data fails'''
+
+    rng = np.random.default_rng(seed)
+
+    results, jobs, owners = [], [], []
+    for idataset, (temperature, density) in enumerate(datasets):
+        try:
+            parameters = fit_tg(temperature, density)[0]
+        except (RuntimeError, ValueError):
+            results.append({"parameters": None})
+            continue
+        results.append({"parameters": parameters, "tg": parameters[1]})
+        if method == "none":
+            continue
+
+        # the resamples start from the parameters of the full data
+        indices = resample_indices(temperature.size, method, n_resamples, rng)
+        for chunk in np.array_split(indices, max(1, 4*workers//len(datasets))):
+            jobs.append((temperature, density, parameters, chunk))
+            owners.append(idataset)
+
+    tg_values = [[] for _ in datasets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for idataset, values in zip(owners, pool.map(_fit_resamples, jobs)):
+            tg_values[idataset].append(values)
+
+    for result, values in zip(results, tg_values):
+        if result["parameters"] is None:
+            continue
+        values = np.concatenate(values) if values else np.zeros(0)
+        error, lower, upper = tg_uncertainty(result["tg"], values, method, confidence)
+        result.update(error=error, lower=lower, upper=upper,
+                      failed=int(np.count_nonzero(~np.isfinite(values))))
+
+    return results
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+
+    parser = ArgumentParser(description='Computing the glass transition temperature of many \
+                            cooling curves')
+
+    parser.add_argument("output_file", help="The full path & name of the output file. It holds \
+                        one line per input file with Tg, its standard error & confidence interval")
+    parser.add_argument("input_files", nargs="+", help="The files with the temperature in \
+                        Kelvin and the density in two columns after one comment line")
+    parser.add_argument("-v","--specific_volume", action="store_true", help="The second column \
+                        is the specific volume instead of the density")
+    parser.add_argument("-m","--method", default="bootstrap", choices=["bootstrap", "jackknife",
+                                                                      "none"],
+                        help="The resampling for the uncertainty of Tg")
+    parser.add_argument("-nr","--n_resamples", default=1000, type=int, help="The number of \
+                        bootstrap resamples. The jackknife leaves out every point once")
+    parser.add_argument("-c","--confidence", default=0.95, type=float, help="The confidence \
+                        level of the interval of Tg")
+    parser.add_argument("--seed", default=None, type=int, help="The seed of the bootstrap")
+    parser.add_argument("-j","--workers", default=os.cpu_count(), type=int, help="The number \
+                        of worker processes")
+
+    arguments = parser.parse_args()
+
+    for input_file in arguments.input_files:
+        if not os.path.exists(input_file):
+            print(f"The input file {input_file} does not exist. The script will exit")
+            sys.exit()
+
+    if arguments.n_resamples < 2 or arguments.workers < 1:
+        print("The number of resamples must exceed one and the number of workers be positive. \
+The script will exit")
+        sys.exit()
+
+    if not 0 < arguments.confidence < 1:
+        print("The confidence level must be between 0 and 1. The script will exit")
+        sys.exit()
+
+    return arguments
+
+def main():
+    '''The main function for computing the glass transition temperature of many datasets'''
+
+    args = create_cli()
+
+    datasets = []
+    for input_file in args.input_files:
+        temperature, measurement = np.loadtxt(input_file, skiprows=1, unpack=True)
+        # convert data for specific volume into data for density
+        datasets.append((temperature, 1.0/measurement if args.specific_volume else measurement))
+
+    results = batch_tg(datasets, args.method, args.n_resamples, args.workers, args.confidence,
+                       args.seed)
+
+    with open(args.output_file, "w", encoding="utf-8") as ofile:
+        ofile.write("# file Tg Tg_error Tg_lower Tg_upper rho0 alpha beta gamma failed\n")
+        for input_file, result in zip(args.input_files, results):
+            if result["parameters"] is None:
+                print(f"The fit of {input_file} did not converge")
+                continue
+            rho0, tg, alpha, bita, gamma = result["parameters"]
+            columns = " ".join(f"{value:.6f}" for value in
+                               (tg, result.get("error", np.nan), result.get("lower", np.nan),
+                                result.get("upper", np.nan), rho0, alpha, bita, gamma))
+            ofile.write(f"{input_file} {columns} {result.get('failed', 0)}\n")
+
+if __name__ == "__main__":
+    main()
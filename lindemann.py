@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""Streaming computation of the Lindemann parameter
+   delta = 2/(N(N-1)) sum_{i<j} sqrt(<r_ij^2>_t - <r_ij>_t^2)/<r_ij>_t
+   Only the upper triangle of the pair matrix is stored, in the condensed order
+   (0,1), (0,2), ..., (0,N-1), (1,2), ... and the time averages are updated in place
+   with Welford's algorithm, so no N x N matrix is allocated per frame.
+   Run as a script it computes the Lindemann parameter of a temperature sweep, one
+   LAMMPS dump file per temperature, with a pool of worker processes
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from dump_reader import DumpReader
+from neighbour_list import CellList
+
+class LindemannAccumulator:
+    '''Running mean and variance of all pair distances of a configuration with N particles'''
+
+    def __init__(self, natoms, dtype=np.float64):
+
+        self.natoms = natoms
+        self.dtype = np.dtype(dtype)
+        self.nframes = 0
+
+        npairs = natoms*(natoms - 1)//2
+        self.mean = np.zeros(npairs, dtype=self.dtype)
+        self.sum_squares = np.zeros(npairs, dtype=self.dtype)
+
+        # start of the pairs of every particle i with the particles j > i
+        self.offsets = np.concatenate(([0], np.cumsum(np.arange(natoms - 1, 0, -1))))
+
+        # work buffers for a single row of the upper triangle
+        self._distance = np.zeros(natoms, dtype=self.dtype)
+        self._delta = np.zeros(natoms, dtype=self.dtype)
+        self._work = np.zeros(natoms, dtype=self.dtype)
+
+    def _row_distances(self, coords, box, iatom):
+        '''Compute the distances of particle iatom to all particles j > iatom in the buffer'''
+
+        size = self.natoms - 1 - iatom
+        distance = self._distance[:size]
+        work = self._work[:size]
+
+        distance[:] = 0
+        for idim in range(3):
+            np.subtract(coords[idim][iatom + 1:], coords[idim][iatom], out=work)
+            if box is not None:
+                # minimum image convention for every pair
+                work -= box[idim]*np.rint(work/box[idim])
+            np.square(work, out=work)
+            distance += work
+        np.sqrt(distance, out=distance)
+
+        return distance
+
+    def add_frame(self, xcoords, ycoords, zcoords, box=None):
+        '''Update the running averages with the pair distances of a new frame'''
+
+        if xcoords.size != self.natoms:
+            raise ValueError("The number of particles differs from the accumulator")
+
+        coords = [np.asarray(coords, dtype=self.dtype) for coords in (xcoords, ycoords, zcoords)]
+        box = None if box is None else np.asarray(box, dtype=self.dtype)
+
+        self.nframes += 1
+        for iatom in range(self.natoms - 1):
+            pairs = slice(self.offsets[iatom], self.offsets[iatom + 1])
+            self._welford_update(pairs, self._row_distances(coords, box, iatom))
+
+    def _welford_update(self, pairs, distance):
+        '''Welford's update of the mean and of the sum of squared deviations of some pairs'''
+
+        delta = self._delta[:distance.size]
+        work = self._work[:distance.size]
+
+        np.subtract(distance, self.mean[pairs], out=delta)
+        np.divide(delta, self.nframes, out=work)
+        self.mean[pairs] += work
+        np.subtract(distance, self.mean[pairs], out=work)
+        work *= delta
+        self.sum_squares[pairs] += work
+
+    def merge(self, other):
+        '''Combine the running averages of another accumulator over different frames
+
+        The partial sums are combined with the parallel formula of Chan et al, so the
+        frames of a trajectory can be split among several accumulators'''
+
+        if other.nframes == 0:
+            return self
+
+        total = self.nframes + other.nframes
+        delta = other.mean - self.mean
+        self.sum_squares += other.sum_squares + np.square(delta)*(self.nframes*other.nframes/total)
+        self.mean += delta*(other.nframes/total)
+        self.nframes = total
+
+        return self
+
+    def pair_indices(self):
+        '''Return the delta_ij of every pair in the condensed order'''
+
+        variance = self.sum_squares/max(self.nframes, 1)
+        return np.sqrt(np.maximum(variance, 0))/self.mean
+
+    def lindemann_index(self):
+        '''Return the Lindemann parameter averaged over all pairs'''
+
+        if self.mean.size == 0:
+            return 0.0
+
+        return float(np.mean(self.pair_indices(), dtype=np.float64))
+
+class NeighbourLindemannAccumulator(LindemannAccumulator):
+    '''Running mean and variance of the distances of the pairs within a cutoff
+
+    The pairs are found with a cell list in a reference frame and tracked in all
+    frames, so the cost per frame grows linearly with the number of particles'''
+
+    def __init__(self, reference_frame, cutoff, dtype=np.float64):
+
+        xcoords, ycoords, zcoords, box = reference_frame
+        self.natoms = xcoords.size
+        self.dtype = np.dtype(dtype)
+        self.nframes = 0
+        self.cutoff = cutoff
+
+        cells = CellList(np.column_stack((xcoords, ycoords, zcoords)), cutoff, box)
+        found = list(cells.pairs())
+        self.first = np.concatenate([first for first, _, _ in found])
+        self.second = np.concatenate([second for _, second, _ in found])
+
+        self.mean = np.zeros(self.first.size, dtype=self.dtype)
+        self.sum_squares = np.zeros(self.first.size, dtype=self.dtype)
+
+        # work buffers for the distances of all tracked pairs
+        self._distance = np.zeros(self.first.size, dtype=self.dtype)
+        self._delta = np.zeros(self.first.size, dtype=self.dtype)
+        self._work = np.zeros(self.first.size, dtype=self.dtype)
+
+    def add_frame(self, xcoords, ycoords, zcoords, box=None):
+        '''Update the running averages with the distances of the tracked pairs in a new frame'''
+
+        if xcoords.size != self.natoms:
+            raise ValueError("The number of particles differs from the accumulator")
+
+        distance = self._distance
+        work = self._work
+
+        distance[:] = 0
+        for idim, coords in enumerate((xcoords, ycoords, zcoords)):
+            coords = np.asarray(coords, dtype=self.dtype)
+            np.subtract(coords[self.second], coords[self.first], out=work)
+            if box is not None:
+                # minimum image convention for every pair
+                work -= box[idim]*np.rint(work/box[idim])
+            np.square(work, out=work)
+            distance += work
+        np.sqrt(distance, out=distance)
+
+        self.nframes += 1
+        self._welford_update(slice(None), distance)
+
+    def per_atom_indices(self):
+        '''Return the Lindemann index of every particle, averaged over its tracked pairs'''
+
+        pair_indices = self.pair_indices().astype(np.float64)
+        total = np.bincount(self.first, pair_indices, self.natoms) + \
+                np.bincount(self.second, pair_indices, self.natoms)
+        npairs = np.bincount(self.first, minlength=self.natoms) + \
+                 np.bincount(self.second, minlength=self.natoms)
+
+        return np.divide(total, npairs, out=np.zeros(self.natoms), where=npairs > 0)
+
+def lindemann_parameter(frames, dtype=np.float64):
+    '''Compute the Lindemann parameter of the frames given by an iterator
+
+    Every frame is a tuple with the x, y, z coordinates and the box lengths,
+    which may be None for a system without periodic boundary conditions'''
+
+    accumulator = None
+    for xcoords, ycoords, zcoords, box in frames:
+        if accumulator is None:
+            accumulator = LindemannAccumulator(xcoords.size, dtype)
+        accumulator.add_frame(xcoords, ycoords, zcoords, box)
+
+    if accumulator is None:
+        raise ValueError("The trajectory has no frames")
+
+    return accumulator.lindemann_index()
+
+def neighbour_lindemann_parameter(frames, cutoff, dtype=np.float64):
+    '''Compute the global and the per-atom Lindemann index of the pairs within a cutoff
+
+    The pairs are selected in the first frame given by the iterator'''
+
+    accumulator = None
+    for xcoords, ycoords, zcoords, box in frames:
+        if accumulator is None:
+            accumulator = NeighbourLindemannAccumulator((xcoords, ycoords, zcoords, box), cutoff,
+                                                        dtype)
+        accumulator.add_frame(xcoords, ycoords, zcoords, box)
+
+    if accumulator is None:
+        raise ValueError("The trajectory has no frames")
+
+    return accumulator.lindemann_index(), accumulator.per_atom_indices()
+
+def accumulate_dump_frames(dump_file, start=0, stop=None, dtype=np.float64, cutoff=None):
+    '''Return an accumulator over the frames start:stop of a LAMMPS dump file
+
+    With a cutoff only the pairs within the cutoff in the first frame of the file
+    are tracked, so that the accumulators of different frame ranges can be merged'''
+
+    with DumpReader(dump_file) as reader:
+        accumulator = None
+        if cutoff is not None:
+            accumulator = NeighbourLindemannAccumulator(reader.read_frame(0)[1:], cutoff, dtype)
+        for natoms, xcoords, ycoords, zcoords, box in reader.frames(start, stop):
+            if accumulator is None:
+                accumulator = LindemannAccumulator(natoms, dtype)
+            accumulator.add_frame(xcoords, ycoords, zcoords, box)
+
+    return accumulator
+
+def frame_ranges(dump_file, nframes=None, frame_chunks=1):
+    '''Split the first nframes frames of a dump file into frame_chunks contiguous ranges'''
+
+    if frame_chunks == 1:
+        return [(0, nframes)]
+
+    # the frame index is saved, so the workers of the ranges only load it
+    with DumpReader(dump_file) as reader:
+        total = len(reader) if nframes is None else min(nframes, len(reader))
+
+    bounds = np.linspace(0, total, frame_chunks + 1).astype(int)
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+def lindemann_sweep(dump_files, temperatures, workers=1, frame_chunks=1, nframes=None,
+                    dtype=np.float64, cutoff=None):
+    '''Compute the Lindemann parameter for every (temperature, dump file) pair in parallel
+
+    Each file may be split further in frame_chunks ranges of frames whose partial
+    accumulators are merged. Returns the temperatures, the Lindemann parameters and
+    the accumulators, which give the per-atom indices when a cutoff is used'''
+
+    if len(dump_files) != len(temperatures):
+        raise ValueError("The number of dump files differs from the number of temperatures")
+
+    accumulators = [None]*len(dump_files)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # the frame indexes of the files are built in parallel and the ranges of a file
+        # are submitted as soon as its index is ready
+        indexes = {pool.submit(frame_ranges, dump_file, nframes, frame_chunks): ifile
+                   for ifile, dump_file in enumerate(dump_files)}
+        jobs = {}
+        for index in as_completed(indexes):
+            ifile = indexes[index]
+            for start, stop in index.result():
+                jobs[pool.submit(accumulate_dump_frames, dump_files[ifile], start, stop, dtype,
+                                 cutoff)] = ifile
+        for idone, job in enumerate(as_completed(jobs), 1):
+            ifile = jobs[job]
+            partial = job.result()
+            if accumulators[ifile] is None:
+                accumulators[ifile] = partial
+            elif partial is not None:
+                accumulators[ifile].merge(partial)
+            print(f"\rProcessed {idone}/{len(jobs)} tasks", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    lindemann_values = np.array([accumulator.lindemann_index() for accumulator in accumulators])
+
+    return np.asarray(temperatures, dtype=float), lindemann_values, accumulators
+
+def create_cli():
+    '''Create an elementary CLI based on the argparse module & perform initial consistency checks'''
+
+    parser = ArgumentParser(description='Computing the Lindemann parameter of a temperature sweep')
+
+    parser.add_argument("output_file", help="The full path & name of the output file. It \
+                        contains the temperature and the Lindemann parameter")
+    parser.add_argument("dump_files", nargs="+", help="The LAMMPS dump files, one per temperature")
+    parser.add_argument("-T","--temperatures", nargs="+", type=float, required=True,
+                        help="The temperature of every dump file")
+    parser.add_argument("-n","--number_of_frames", default=None, type=int, help="Use only the \
+                        first frames of every dump file")
+    parser.add_argument("-j","--workers", default=os.cpu_count(), type=int, help="The number \
+                        of worker processes")
+    parser.add_argument("--frame_chunks", default=1, type=int, help="Split the frames of every \
+                        dump file into this many ranges processed by different workers")
+    parser.add_argument("-rc","--cutoff", default=None, type=float, help="Track only the pairs \
+                        closer than the cutoff in the first frame, found with a cell list")
+    parser.add_argument("--per_atom", default=None, help="A .npz file for the per-atom \
+                        Lindemann indices of every temperature. Requires a cutoff")
+    parser.add_argument("--single_precision", action="store_true", help="Store the running \
+                        averages in float32")
+
+    arguments = parser.parse_args()
+
+    for dump_file in arguments.dump_files:
+        if not os.path.exists(dump_file):
+            print(f"The dump file {dump_file} does not exist. The script will exit")
+            sys.exit()
+
+    if len(arguments.temperatures) != len(arguments.dump_files):
+        print("One temperature is needed for every dump file. The script will exit")
+        sys.exit()
+
+    if arguments.per_atom is not None and arguments.cutoff is None:
+        print("The per-atom indices require a cutoff. The script will exit")
+        sys.exit()
+
+    if arguments.cutoff is not None and arguments.cutoff <= 0:
+        print("The cutoff must be a positive number. The script will exit")
+        sys.exit()
+
+    if arguments.workers < 1 or arguments.frame_chunks < 1:
+        print("The number of workers and of frame chunks must be positive. The script will exit")
+        sys.exit()
+
+    return arguments
+
+def main():
+    '''The main function for computing the Lindemann parameter as a function of temperature'''
+
+    args = create_cli()
+    dtype = np.float32 if args.single_precision else np.float64
+
+    temperatures, lindemann_values, accumulators = lindemann_sweep(args.dump_files,
+                                                                   args.temperatures, args.workers,
+                                                                   args.frame_chunks,
+                                                                   args.number_of_frames, dtype,
+                                                                   args.cutoff)
+
+    np.savetxt(args.output_file, np.c_[temperatures, lindemann_values])
+
+    if args.per_atom is not None:
+        np.savez(args.per_atom, temperatures=temperatures,
+                 per_atom=np.array([accumulator.per_atom_indices()
+                                    for accumulator in accumulators]))
+
+if __name__ == "__main__":
+    main()
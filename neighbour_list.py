@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""Neighbour search with cell lists
+   The particles are sorted into cells with an edge of at least the cutoff, so only
+   the particles of the same and of the adjacent cells have to be checked.
+   The box is orthorhombic and periodic in all three directions when its lengths are given
+"""
+
+from itertools import product
+import numpy as np
+
+def minimum_image(delta, box):
+    '''Apply the minimum image convention to difference vectors with x, y, z in the last axis'''
+
+    return delta - box*np.rint(delta/box)
+
+class CellList:
+    '''Cell list of a configuration given as an (N, 3) array of coordinates'''
+
+    def __init__(self, coords, cutoff, box=None):
+
+        self.coords = np.asarray(coords, dtype=float)
+        self.cutoff = cutoff
+        self.box = None if box is None else np.asarray(box, dtype=float)
+
+        # without a box the cells span the bounding box of the particles
+        if self.box is None:
+            origin = self.coords.min(axis=0) if len(self.coords) else np.zeros(3)
+            lengths = np.ptp(self.coords, axis=0) + cutoff if len(self.coords) else np.ones(3)
+        else:
+            origin = np.zeros(3)
+            lengths = self.box
+        self.ncells = np.maximum(1, np.floor(lengths/cutoff).astype(int))
+
+        cell_coords = np.floor((self.coords - origin)/lengths*self.ncells).astype(int)
+        self.cell_coords = np.mod(cell_coords, self.ncells)
+        cell_ids = self._cell_id(self.cell_coords)
+
+        # a padded table with the particles of every cell, -1 marks an empty slot
+        order = np.argsort(cell_ids, kind="stable")
+        occupancy = np.bincount(cell_ids, minlength=np.prod(self.ncells))
+        starts = np.cumsum(occupancy) - occupancy
+        self.cell_atoms = -np.ones((occupancy.size, max(1, occupancy.max(initial=0))), dtype=int)
+        self.cell_atoms[cell_ids[order], np.arange(order.size) - starts[cell_ids[order]]] = order
+
+        # with fewer than three cells along a periodic direction some shifts coincide
+        shifts = []
+        for ncell in self.ncells:
+            if self.box is None or ncell >= 3:
+                shifts.append((-1, 0, 1))
+            else:
+                shifts.append(tuple(range(ncell)))
+        self.shifts = np.array(list(product(*shifts)))
+
+    def _cell_id(self, cell_coords):
+        '''Return the flat index of cells given by their integer coordinates'''
+
+        return (cell_coords[..., 0]*self.ncells[1] + cell_coords[..., 1])*self.ncells[2] + \
+                cell_coords[..., 2]
+
+    def pairs(self, first=0, last=None, chunk_size=2**20):
+        '''Yield the indices i < j and the distance of all pairs closer than the cutoff
+
+        Only the particles i in [first, last) are considered. The pairs come in chunks
+        of about chunk_size candidates so the memory does not grow with the system size'''
+
+        last = len(self.coords) if last is None else last
+        atoms_per_chunk = max(1, chunk_size//self.cell_atoms.shape[1])
+
+        for start in range(first, last, atoms_per_chunk):
+            atoms = np.arange(start, min(start + atoms_per_chunk, last))
+            found_i, found_j, found_r = [], [], []
+
+            for shift in self.shifts:
+                neighbour_cells = self.cell_coords[atoms] + shift
+                if self.box is None:
+                    inside = np.all((neighbour_cells >= 0) & (neighbour_cells < self.ncells), axis=1)
+                else:
+                    inside = np.ones(atoms.size, dtype=bool)
+                    neighbour_cells = np.mod(neighbour_cells, self.ncells)
+
+                candidates = self.cell_atoms[self._cell_id(neighbour_cells[inside])]
+                first_atoms = np.broadcast_to(atoms[inside, None], candidates.shape)
+                keep = candidates > first_atoms
+                first_atoms, candidates = first_atoms[keep], candidates[keep]
+
+                delta = self.coords[candidates] - self.coords[first_atoms]
+                if self.box is not None:
+                    delta = minimum_image(delta, self.box)
+                distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+
+                close = distance < self.cutoff
+                found_i.append(first_atoms[close])
+                found_j.append(candidates[close])
+                found_r.append(distance[close])
+
+            yield np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_r)
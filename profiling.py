@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""Per-stage profiling of the post-processing tools
+   A Profiler records the wall time and the peak memory allocated during every stage
+   of a calculation together with optional counters such as the number of pairs.
+   Hooks registered with the profiler receive every stage record when the stage ends,
+   so embedding code can collect the same metrics as the JSON report. The allocations
+   of worker processes are invisible to tracemalloc, so stages run with more than one
+   worker report the peak resident memory of the finished workers instead
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def peak_rss_mb(children=False):
+    '''Return the peak resident memory of the current process in MB
+
+    With children the peak of the largest child process that has finished so far is
+    returned instead. None where the resource module is not available'''
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else
+                              resource.RUSAGE_SELF).ru_maxrss
+    # the peak is reported in bytes on macOS and in kB on Linux
+    return peak/1024**2 if sys.platform == "darwin" else peak/1024
+
+class Profiler:
+    '''Collect the records of the stages of a calculation'''
+
+    def __init__(self, hooks=None, trace_memory=True):
+
+        self.hooks = list(hooks) if hooks is not None else []
+        self.trace_memory = trace_memory
+        self.records = []
+        self.start = time.perf_counter()
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_hook(self, hook):
+        '''Register a function called with the record of every finished stage'''
+
+        self.hooks.append(hook)
+
+    def _finish(self, record):
+        '''Derive the throughput of a record, store it and pass it to the hooks'''
+
+        if record.get("pairs") is not None and record["seconds"] > 0:
+            record["pairs_per_second"] = record["pairs"]/record["seconds"]
+
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    @contextmanager
+    def stage(self, name, **counters):
+        '''Measure the wall time and the peak memory of the enclosed block
+
+        The yielded record may be updated with counters inside the block. With a
+        workers counter above one the peak memory is None and worker_peak_rss_mb holds
+        the peak resident memory of the largest worker process finished so far'''
+
+        record = {"stage": name, **counters}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+
+        yield record
+
+        record["seconds"] = time.perf_counter() - start
+        if self.trace_memory and record.get("workers", 1) > 1:
+            # the peak of the parent alone would hide the memory of the workers
+            record["peak_memory_mb"] = None
+            record["worker_peak_rss_mb"] = peak_rss_mb(children=True)
+        elif self.trace_memory:
+            record["peak_memory_mb"] = (tracemalloc.get_traced_memory()[1] - memory_start)/1024**2
+        self._finish(record)
+
+    def record(self, name, seconds, **counters):
+        '''Add a stage measured elsewhere, e.g. accumulated over many short intervals'''
+
+        self._finish({"stage": name, "seconds": seconds, **counters})
+
+    def report(self, **metadata):
+        '''Return the records and the total time as a dictionary'''
+
+        return {**metadata, "total_seconds": time.perf_counter() - self.start,
+                "stages": self.records}
+
+    def write_report(self, output_file, **metadata):
+        '''Write the report as a JSON file'''
+
+        with open(output_file, "w", encoding="utf-8") as ofile:
+            json.dump(self.report(**metadata), ofile, indent=1)
+
+def profile_stage(profiler, name, **counters):
+    '''Return the stage context of a profiler, or a context doing nothing without a profiler'''
+
+    if profiler is None:
+        return nullcontext({})
+
+    return profiler.stage(name, **counters)
+
+def timed_iterator(iterable, profiler, name, count=len):
+    '''Yield the items of an iterable and record the time spent producing them as a stage
+
+    The count function gives the number of pairs contained in every item'''
+
+    elapsed = 0.0
+    pairs = 0
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            break
+        finally:
+            elapsed += time.perf_counter() - start
+        pairs += count(item)
+        yield item
+
+    profiler.record(name, elapsed, pairs=pairs)
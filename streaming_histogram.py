@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""Histograms of bond/angle sample files that are too large to be loaded at once
+   The file is read in blocks of bytes, every block is parsed in bulk and binned into
+   fixed edges, so the memory does not depend on the number of samples. The edges are
+   given or found in a first pass over the file, like np.histogram with a number of
+   bins. A file is split into shards at line boundaries, every shard is binned by a
+   worker process and the histograms of the shards are merged
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
+import numpy as np
+
+class StreamingHistogram:
+    '''Counts of the values added in blocks in the bins defined by fixed edges'''
+
+    def __init__(self, edges):
+
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(self.edges.size - 1, dtype=np.int64)
+        # the values outside the edges are counted but not binned
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, values):
+        '''Bin a block of values'''
+
+        self.counts += np.histogram(values, self.edges)[0]
+        self.underflow += np.count_nonzero(values < self.edges[0])
+        self.overflow += np.count_nonzero(values > self.edges[-1])
+
+    def merge(self, other):
+        '''Add the counts of a histogram with the same edges, e.g. of another shard'''
+
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only histograms with the same edges can be merged")
+
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+        return self
+
+    def bin_centers(self):
+        '''Return the midpoints of the bins'''
+
+        return 0.5*(self.edges[:-1] + self.edges[1:])
+
+    def density(self):
+        '''Return the probability density as np.histogram with density=True'''
+
+        return self.counts/(self.counts.sum()*np.diff(self.edges))
+
+    def distribution(self):
+        '''Return the bin centers and the probability density, the input of the fitting'''
+
+        return self.bin_centers(), self.density()
+
+def uniform_edges(minimum, maximum, bins):
+    '''Return the edges of equally wide bins between minimum and maximum as np.histogram'''
+
+    if minimum == maximum:
+        minimum, maximum = minimum - 0.5, maximum + 0.5
+
+    return np.linspace(minimum, maximum, bins + 1)
+
+def parse_column(block, column=1):
+    '''Return one column of a block of complete lines'''
+
+    if not block.strip():
+        return np.zeros(0)
+
+    # the C parser of loadtxt converts only the requested column
+    return np.loadtxt(io.BytesIO(block), usecols=column, ndmin=1, encoding="latin1")
+
+def shard_offsets(input_file, nshards):
+    '''Split a file into byte ranges of similar size that start at the beginning of a line'''
+
+    size = os.path.getsize(input_file)
+    offsets = [0]
+    with open(input_file, "rb") as ifile:
+        for ishard in range(1, nshards):
+            ifile.seek(max(offsets[-1], ishard*size//nshards))
+            # move to the start of the next line
+            if ifile.tell() > 0:
+                ifile.seek(ifile.tell() - 1)
+                ifile.readline()
+            offsets.append(ifile.tell())
+    offsets.append(size)
+
+    return [(start, stop) for start, stop in zip(offsets[:-1], offsets[1:]) if stop > start]
+
+def read_blocks(input_file, column=1, skiprows=1, block_size=64, start=0, stop=None):
+    '''Yield the values of a column of a text file in blocks of about block_size MB
+
+    Only the lines between the byte offsets start and stop are read. The header
+    lines are skipped only at the beginning of the file'''
+
+    stop = os.path.getsize(input_file) if stop is None else stop
+    with open(input_file, "rb") as ifile:
+        ifile.seek(start)
+        if start == 0:
+            for _ in range(skiprows):
+                ifile.readline()
+
+        position = ifile.tell()
+        remainder = b""
+        while position < stop:
+            chunk = ifile.read(min(int(block_size*1024**2), stop - position))
+            if not chunk:
+                break
+            position += len(chunk)
+            chunk = remainder + chunk
+
+            # the last incomplete line is kept for the next block
+            remainder = b""
+            if position < stop:
+                cut = chunk.rfind(b"\n") + 1
+                chunk, remainder = chunk[:cut], chunk[cut:]
+            yield parse_column(chunk, column)
+
+        if remainder:
+            yield parse_column(remainder, column)
+
+def shard_range(input_file, start, stop, column=1, skiprows=1, block_size=64):
+    '''Return the minimum and the maximum value in a shard of a file'''
+
+    minimum, maximum = np.inf, -np.inf
+    for values in read_blocks(input_file, column, skiprows, block_size, start, stop):
+        if values.size:
+            minimum, maximum = min(minimum, values.min()), max(maximum, values.max())
+
+    return minimum, maximum
+
+def shard_histogram(input_file, start, stop, edges, column=1, skiprows=1, block_size=64):
+    '''Return the histogram of the values in a shard of a file'''
+
+    histogram = StreamingHistogram(edges)
+    for values in read_blocks(input_file, column, skiprows, block_size, start, stop):
+        histogram.add(values)
+
+    return histogram
+
+def file_histogram(input_file, bins=100, value_range=None, workers=1, column=1, skiprows=1,
+                   block_size=64):
+    '''Build the histogram of a column of a sample file with one shard per worker
+
+    Without a value range the minimum and the maximum are found in a first pass, so
+    the edges are those of np.histogram for the whole column'''
+
+    shards = shard_offsets(input_file, workers)
+    starts, stops = [start for start, _ in shards], [stop for _, stop in shards]
+    options = (repeat(column), repeat(skiprows), repeat(block_size))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if value_range is None:
+            ranges = list(pool.map(shard_range, repeat(input_file), starts, stops, *options))
+            value_range = (min(minimum for minimum, _ in ranges),
+                           max(maximum for _, maximum in ranges))
+            if not np.isfinite(value_range).all():
+                raise ValueError(f"The file {input_file} holds no samples")
+
+        edges = uniform_edges(*value_range, bins)
+        histograms = pool.map(shard_histogram, repeat(input_file), starts, stops, repeat(edges),
+                              *options)
+
+        return reduce(StreamingHistogram.merge, histograms)